@@ -7,33 +7,115 @@ https://github.com/ARosman77/DHMZ_weather
 
 from __future__ import annotations
 
+import asyncio
+from datetime import timedelta
+
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.typing import ConfigType
 
-from .api import DHMZApiClient
-from .const import DOMAIN
+from .api import DHMZMeteoData
+from .const import (
+    BACKGROUND_FEEDS,
+    CONF_REGION,
+    CONF_VIRTUAL_STATION,
+    DATA_HUB,
+    DOMAIN,
+    FEED_UPDATE_INTERVALS,
+    FORECAST_FEEDS,
+    LAZY_FEED_UPDATE_INTERVALS,
+)
 from .coordinator import DHMZDataUpdateCoordinator
+from .hub import async_get_hub
+from .services import async_setup_services
 
 PLATFORMS: list[Platform] = [
     Platform.SENSOR,
     Platform.WEATHER,
 ]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up services of the integration."""
+    async_setup_services(hass)
+    return True
+
+
+def _is_restored(data: DHMZMeteoData | None, feed: str, region: str) -> bool:
+    """Return True if restored snapshot has usable data of the feed.
+
+    Age is not checked, restored feeds are published as stale however old
+    they are and replaced by the background refresh.
+    """
+    if data is None or data.feed_age(feed) is None:
+        return False
+    if feed in FORECAST_FEEDS and data.regions[feed] is not None:
+        return region in data.regions[feed]
+    return True
+
 
 # https://developers.home-assistant.io/docs/config_entries_index/#setting-up-an-entry
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up this integration using UI."""
-    hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN][entry.entry_id] = coordinator = DHMZDataUpdateCoordinator(
-        hass=hass,
-        client=DHMZApiClient(
-            session=async_get_clientsession(hass),
-        ),
+    hub = async_get_hub(hass)
+    virtual_station = entry.options.get(CONF_VIRTUAL_STATION)
+    hub.register(
+        entry.entry_id,
+        entry.data[CONF_REGION],
+        virtual_station=(virtual_station["latitude"], virtual_station["longitude"])
+        if virtual_station
+        else None,
     )
+    # One coordinator per feed, each polled with its own interval
+    hass.data[DOMAIN][entry.entry_id] = coordinators = {
+        feed: DHMZDataUpdateCoordinator(
+            hass=hass,
+            hub=hub,
+            feed=feed,
+            update_interval=timedelta(minutes=entry.options.get(option, default)),
+        )
+        for feed, (option, default) in FEED_UPDATE_INTERVALS.items()
+    }
+    # Lazy feeds are refreshed only while their coordinators have listeners
+    coordinators.update(
+        {
+            feed: DHMZDataUpdateCoordinator(
+                hass=hass,
+                hub=hub,
+                feed=feed,
+                update_interval=timedelta(minutes=interval),
+            )
+            for feed, interval in LAZY_FEED_UPDATE_INTERVALS.items()
+        }
+    )
+    # Feeds found in the persisted snapshot are shown right away (as stale)
+    # and refreshed in the background, as are background feeds. Only the
+    # others are awaited.
+    restored = await hub.async_restore()
+    first_refresh = []
+    for feed, coordinator in coordinators.items():
+        is_restored = _is_restored(restored, feed, entry.data[CONF_REGION])
+        if is_restored:
+            coordinator.async_set_updated_data(restored)
+        if feed in LAZY_FEED_UPDATE_INTERVALS:
+            continue
+        if is_restored or feed in BACKGROUND_FEEDS:
+            entry.async_create_background_task(
+                hass, coordinator.async_refresh(), f"{coordinator.name} refresh"
+            )
+        else:
+            first_refresh.append(coordinator)
     # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
-    await coordinator.async_config_entry_first_refresh()
+    await asyncio.gather(
+        *(
+            coordinator.async_config_entry_first_refresh()
+            for coordinator in first_refresh
+        )
+    )
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
@@ -45,10 +127,11 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Handle removal of an entry."""
     if unloaded := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         hass.data[DOMAIN].pop(entry.entry_id)
+        if hass.data[DOMAIN][DATA_HUB].unregister(entry.entry_id):
+            hass.data[DOMAIN].pop(DATA_HUB)
     return unloaded
 
 
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Reload config entry."""
-    await async_unload_entry(hass, entry)
-    await async_setup_entry(hass, entry)
+    await hass.config_entries.async_reload(entry.entry_id)
@@ -2,15 +2,115 @@
 
 from __future__ import annotations
 
+import re
+import sys
 import xml.etree.ElementTree as ET
-from datetime import datetime
+from array import array
+from collections.abc import Iterable
+from io import BytesIO
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from hashlib import sha1
+from random import uniform
+from time import monotonic, perf_counter
+from typing import NamedTuple
+from urllib.parse import urlsplit
+from zoneinfo import ZoneInfo
 
 import asyncio
 import socket
 import aiohttp
 import async_timeout
 
-from .const import LOGGER
+from .const import (
+    FEED_CURRENT,
+    FEED_FORECAST_3D,
+    FEED_FORECAST_7D,
+    FEED_SEA,
+    FEED_SUMMARY_TODAY,
+    FEED_SUMMARY_TOMORROW,
+    FORECAST_FEEDS,
+    LOGGER,
+    SUMMARY_FEEDS,
+)
+from .spatial import DHMZSpatialIndex
+from .telemetry import DHMZFeedTelemetry, DHMZTelemetry
+
+FEED_URLS = {
+    FEED_CURRENT: "https://vrijeme.hr/hrvatska_n.xml",
+    FEED_FORECAST_3D: "https://prognoza.hr/tri/3d_graf_i_simboli.xml",
+    FEED_FORECAST_7D: "https://prognoza.hr/sedam/hrvatska/7d_meteogrami.xml",
+    FEED_SEA: "https://vrijeme.hr/more_n.xml",
+    FEED_SUMMARY_TODAY: "https://prognoza.hr/prognoza_danas.xml",
+    FEED_SUMMARY_TOMORROW: "https://prognoza.hr/prognoza_sutra.xml",
+}
+
+# Last good copy of a failed feed is served only while it is younger than this
+STALE_DATA_MAX_AGE = timedelta(hours=3)
+
+# Responses are requested compressed and read in chunks, the (decompressed)
+# body must not exceed the size limit (bytes)
+ACCEPT_ENCODING = "gzip, deflate"
+RESPONSE_CHUNK_SIZE = 64 * 1024
+RESPONSE_SIZE_MAX = 8 * 1024 * 1024
+
+# Transient errors are retried, after a delay (seconds) doubling with each
+# attempt, randomized by +-50 % so entries don't retry in lockstep
+RETRY_ATTEMPTS = 3
+RETRY_DELAY = 2.0
+RETRY_DELAY_MAX = 30.0
+
+# After this many failed fetches in a row requests to the host are refused
+# for open time (seconds), doubling while trial requests keep failing
+CIRCUIT_FAILURE_THRESHOLD = 3
+CIRCUIT_OPEN_TIME = 300.0
+CIRCUIT_OPEN_TIME_MAX = 3600.0
+# time (seconds) of a trial request, other requests are refused meanwhile
+CIRCUIT_TRIAL_TIME = 60.0
+
+# Time zone of the forecast dates and hours
+FORECAST_TZ = ZoneInfo("Europe/Zagreb")
+
+# more_n.xml has no coordinates, approximate (latitude, longitude) of sea stations
+SEA_LOCATION_COORDINATES = {
+    "Božava": (44.140, 14.906),
+    "Crikvenica": (45.173, 14.689),
+    "Dubrovnik": (42.645, 18.085),
+    "Hvar": (43.171, 16.437),
+    "Komiža": (43.043, 16.088),
+    "Krk": (45.025, 14.575),
+    "Malinska": (45.123, 14.528),
+    "Mali Lošinj": (44.531, 14.468),
+    "Mljet-otvoreno more": (42.740, 17.520),
+    "Mljet-Veliko jezero": (42.771, 17.365),
+    "Mljet-Malo jezero": (42.785, 17.350),
+    "Opatija": (45.338, 14.306),
+    "Pula": (44.867, 13.850),
+    "Rab": (44.756, 14.760),
+    "Rovinj-Sv.Ivan n/p": (45.045, 13.617),
+    "Split": (43.508, 16.440),
+    "Zadar": (44.119, 15.231),
+}
+
+# Daily summary of a city (the others are of regions), used only for stations
+# of the city, e.g. "Zagreb-Maksimir"
+SUMMARY_CITY = "Zagreb"
+
+# Params of the daily summaries parsed as numbers (min / max temperature)
+SUMMARY_NUMBERS = ("Tmn", "Tmx")
+
+# Current data types estimated for virtual stations, from this many stations
+INTERPOLATED_TYPES = ("Temp", "Vlaga", "Tlak", "VjetarBrzina")
+INTERPOLATION_STATIONS = 4
+
+# Forecast data type -> DHMZForecastSeries column
+FORECAST_COLUMNS = {
+    "timestamps": "timestamps",
+    "t_2m": "temperatures",
+    "oborina": "precipitation",
+    "simbol_code": "symbols",
+    "vjetar_code": "winds",
+}
 
 CONDITION_CLASSES = {
     "clear-night": ["1n"],
@@ -86,6 +186,13 @@ CONDITION_CLASSES = {
     "exceptional": [],
 }
 
+# Reverse lookup table, DHMZ weather symbol -> condition
+SYMBOL_CONDITIONS = {
+    symbol: condition
+    for condition, symbols in CONDITION_CLASSES.items()
+    for symbol in symbols
+}
+
 # Currently not needed
 # But can be used to convert string direction to degrees:
 #   WIND_DIRECTION.index(direction) * 22.5
@@ -110,6 +217,85 @@ WIND_DIRECTION = [
 ]
 
 
+def _digest(data: bytes | None) -> str | None:
+    """Return digest of the feed content used to detect unchanged feeds."""
+    return None if data is None else sha1(data).hexdigest()
+
+
+def _to_float(value: str | None) -> float:
+    """Convert numeric text of the feed to float, NaN if missing (or "-")."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+def _to_number(value: str | None) -> float | None:
+    """Convert numeric text of the feed to float, None if missing (or "-")."""
+    number = _to_float(value)
+    return None if number != number else number
+
+
+def _intern(value: str | None) -> str | None:
+    """Return stripped text of the feed, interned as it repeats in every update."""
+    return None if value is None else sys.intern(value.strip())
+
+
+class DHMZObservation(NamedTuple):
+    """Current data of a station (hrvatska_n.xml), numbers parsed at ingest."""
+
+    name: str
+    latitude: float | None
+    longitude: float | None
+    temperature: float | None  # °C
+    humidity: float | None  # %
+    pressure: float | None  # hPa
+    wind_speed: float | None  # m/s
+    wind_direction: str | None  # e.g. "SW"
+    weather: str | None  # description, e.g. "lahor"
+    symbol: str | None  # DHMZ weather symbol, e.g. "6"
+
+
+# Current data type (feed element) -> DHMZObservation field
+OBSERVATION_FIELDS = {
+    "GradIme": "name",
+    "Lat": "latitude",
+    "Lon": "longitude",
+    "Temp": "temperature",
+    "Vlaga": "humidity",
+    "Tlak": "pressure",
+    "VjetarBrzina": "wind_speed",
+    "VjetarSmjer": "wind_direction",
+    "Vrijeme": "weather",
+    "VrijemeZnak": "symbol",
+}
+
+
+class DHMZSeaReading(NamedTuple):
+    """Sea temperature of a station (more_n.xml), the last reading of the day."""
+
+    name: str
+    temperature: float | None  # °C
+    time: str | None  # isoformat
+
+
+# Sea data type (feed element) -> DHMZSeaReading field
+SEA_READING_FIELDS = {
+    "Postaja": "name",
+    "Termin": "temperature",
+    "datetime": "time",
+}
+
+
+class DHMZForecastPoint(NamedTuple):
+    """Forecast of a region at one time, as read from DHMZForecastSeries."""
+
+    timestamp: int
+    temperature: float
+    condition: str | None
+    precipitation: float
+
+
 class DHMZApiClientError(Exception):
     """Exception to indicate a general API error."""
 
@@ -118,140 +304,566 @@ class DHMZApiClientCommunicationError(DHMZApiClientError):
     """Exception to indicate a communication error."""
 
 
+class DHMZApiClientCircuitOpenError(DHMZApiClientCommunicationError):
+    """Request refused, the circuit of the host is open."""
+
+
+class DHMZApiClientResponseTooLargeError(DHMZApiClientError):
+    """Response is larger than RESPONSE_SIZE_MAX."""
+
+
 class DHMZApiClientAuthenticationError(DHMZApiClientError):
     """Exception to indicate an authentication error."""
 
 
+class DHMZTimeTable:
+    """Table of decoded DHMZ (date, hour) pairs.
+
+    Feeds repeat the same few dates and hours for every location, so each
+    distinct pair is decoded to Europe/Zagreb time only once.
+    """
+
+    def __init__(self, date_format: str) -> None:
+        """Initialize empty table for dates in date_format."""
+        self._format = date_format + " %H"
+        self._epochs: dict[tuple[str, str], int] = {}
+        self.times: dict[int, datetime] = {}
+
+    def epoch(self, date: str, hour: str) -> int:
+        """Return epoch seconds of the date and hour."""
+        if (epoch := self._epochs.get((date, hour))) is None:
+            local_time = datetime.strptime(date + " " + hour, self._format).replace(
+                tzinfo=FORECAST_TZ
+            )
+            epoch = self._epochs[(date, hour)] = int(local_time.timestamp())
+            self.times[epoch] = local_time
+        return epoch
+
+    def time(self, date: str, hour: str) -> datetime:
+        """Return time zone aware datetime of the date and hour."""
+        return self.times[self.epoch(date, hour)]
+
+    def add_epoch(self, epoch: int) -> None:
+        """Add already decoded epoch seconds (restored data) to the table."""
+        if epoch not in self.times:
+            self.times[epoch] = datetime.fromtimestamp(epoch, FORECAST_TZ)
+
+
+class DHMZForecastSeries:
+    """Forecast of one region, stored column by column."""
+
+    __slots__ = ("timestamps", "temperatures", "precipitation", "symbols", "winds")
+
+    def __init__(self) -> None:
+        """Initialize empty forecast series."""
+        self.timestamps = array("q")  # epoch seconds
+        self.temperatures = array("d")  # t_2m, °C
+        self.precipitation = array("d")  # oborina, mm
+        self.symbols = array("H")  # simbol, index into DHMZForecastData.symbols
+        self.winds = array("H")  # vjetar, index into DHMZForecastData.winds
+
+    def __len__(self) -> int:
+        """Return number of forecast points."""
+        return len(self.timestamps)
+
+
+class DHMZForecastData:
+    """Parsed forecast feed, series of regions and tables of encoded codes."""
+
+    def __init__(self) -> None:
+        """Initialize empty forecast data."""
+        self.series: dict[str, DHMZForecastSeries] = {}
+        self.regions: list[str] = []
+        self.symbols: list[str] = []
+        self.winds: list[str] = []
+        self.conditions: list[str | None] = []
+        self.times = DHMZTimeTable("%d.%m.%Y.")
+        self._symbol_codes: dict[str, int] = {}
+        self._wind_codes: dict[str, int] = {}
+
+    def encode_symbol(self, symbol: str) -> int:
+        """Return code of the weather symbol, adding it to the table if new."""
+        if (code := self._symbol_codes.get(symbol)) is None:
+            code = self._symbol_codes[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+            self.conditions.append(SYMBOL_CONDITIONS.get(symbol))
+        return code
+
+    def encode_wind(self, wind: str) -> int:
+        """Return code of the wind, adding it to the table if new."""
+        if (code := self._wind_codes.get(wind)) is None:
+            code = self._wind_codes[wind] = len(self.winds)
+            self.winds.append(wind)
+        return code
+
+    def as_dict(self) -> dict:
+        """Return JSON serializable form of the data (missing values as None)."""
+        return {
+            "regions": self.regions,
+            "symbols": self.symbols,
+            "winds": self.winds,
+            "series": {
+                region: {
+                    column: [
+                        None if value != value else value  # NaN
+                        for value in getattr(series, column)
+                    ]
+                    for column in DHMZForecastSeries.__slots__
+                }
+                for region, series in self.series.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> DHMZForecastData:
+        """Return forecast data restored from as_dict() form."""
+        forecast = cls()
+        forecast.regions = list(data["regions"])
+        for symbol in data["symbols"]:
+            forecast.encode_symbol(symbol)
+        for wind in data["winds"]:
+            forecast.encode_wind(wind)
+        for region, columns in data["series"].items():
+            series = forecast.series[region] = DHMZForecastSeries()
+            for column in DHMZForecastSeries.__slots__:
+                getattr(series, column).extend(
+                    float("nan") if value is None else value
+                    for value in columns[column]
+                )
+            for epoch in series.timestamps:
+                forecast.times.add_epoch(epoch)
+        return forecast
+
+
 class DHMZMeteoData:
     """Meteo data class."""
 
     def __init__(
         self,
-        current_data: str,
-        forecast_data_3d: str,
-        forecast_data_7d: str | None = None,
-        forecast_data_today: str | None = None,
-        forecast_data_tomorrow: str | None = None,
-        sea_temp_data: str | None = None,
+        current_data: bytes | None,
+        forecast_data_3d: bytes | None,
+        forecast_data_7d: bytes | None = None,
+        forecast_data_today: bytes | None = None,
+        forecast_data_tomorrow: bytes | None = None,
+        sea_temp_data: bytes | None = None,
+        previous: DHMZMeteoData | None = None,
+        updated: dict[str, datetime] | None = None,
+        stale_feeds: set[str] | None = None,
+        regions: Iterable[str] | None = None,
     ) -> None:
-        """Initialize Meteo data class."""
+        """Initialize Meteo data class.
+
+        When previous snapshot is given, feeds with identical content (same
+        digest) reuse its parsed data instead of being parsed again.
+        updated holds time of last successful download of each feed and
+        stale_feeds feeds that failed and are served from the last good copy.
+        Forecast data (of both forecast feeds) is kept only for regions (all
+        if None), for the other regions only the names are known.
+        Parsing is CPU bound, create instances in executor.
+        """
+        start = perf_counter()
+        # parse time of each parsed (not reused) feed, in seconds
+        self.parse_times: dict[str, float] = {}
         self._current_data = current_data
         self._forecast_data_3d = forecast_data_3d
         self._forecast_data_7d = forecast_data_7d
         self._forecast_data_today = forecast_data_today
         self._forecast_data_tomorrow = forecast_data_tomorrow
         self._sea_temp_data = sea_temp_data
-        self._meteo_data_all = []
-        self._meteo_fc_data_all = []
-        self._meteo_sea_data_all = []
-
-        data_selection = [
-            "Temp",
-            "Vlaga",
-            "Tlak",
-            "VjetarBrzina",
-            "VjetarSmjer",
-            "Vrijeme",
-            "VrijemeZnak",
-        ]
-
-        data_fc_selection = [
-            "t_2m",
-            "simbol",
-            "vjetar",
-            "oborina",
-        ]
+        self.updated = updated or {}
+        self.stale_feeds = stale_feeds or set()
+        bodies = {
+            FEED_CURRENT: current_data,
+            FEED_FORECAST_3D: forecast_data_3d,
+            FEED_FORECAST_7D: forecast_data_7d,
+            FEED_SEA: sea_temp_data,
+            FEED_SUMMARY_TODAY: forecast_data_today,
+            FEED_SUMMARY_TOMORROW: forecast_data_tomorrow,
+        }
+        self.digests = {feed: _digest(body) for feed, body in bodies.items()}
+        if previous is not None:
+            # Feeds not downloaded yet (e.g. after restore) keep previous data
+            for feed, body in bodies.items():
+                if body is None and feed in previous.updated:
+                    self.digests[feed] = previous.digests.get(feed)
+                    self.updated.setdefault(feed, previous.updated[feed])
+                    if feed in previous.stale_feeds:
+                        self.stale_feeds.add(feed)
+        unchanged = {
+            feed
+            for feed, digest in self.digests.items()
+            if previous is not None and previous.digests.get(feed) == digest
+        }
 
         # Current data processing -> _meteo_data_all
+        if FEED_CURRENT in unchanged:
+            self._meteo_data_all = previous._meteo_data_all
+        else:
+            self._meteo_data_all = self._timed_parse(
+                FEED_CURRENT, self._parse_current_data, current_data
+            )
+
+        # Sea temperature data -> _meteo_sea_data_all
+        if FEED_SEA in unchanged:
+            self._meteo_sea_data_all = previous._meteo_sea_data_all
+        else:
+            self._meteo_sea_data_all = self._timed_parse(
+                FEED_SEA, self._parse_sea_temp_data, sea_temp_data
+            )
+
+        # Regional daily summaries (prognoza_danas/sutra.xml) -> _summaries
+        self._summaries = {
+            feed: previous._summaries[feed]
+            if feed in unchanged
+            else self._timed_parse(
+                feed, self._parse_summary_data, bodies[feed], FEED_URLS[feed]
+            )
+            for feed in SUMMARY_FEEDS
+        }
+
+        # Forecast data processing -> _meteo_fc_data, by forecast feed
+        # (previous data is usable only if it covers all requested regions
+        # or if there is nothing new to parse), regions are those covered
+        regions = None if regions is None else frozenset(regions)
+        self._meteo_fc_data: dict[str, DHMZForecastData] = {}
+        self.regions: dict[str, frozenset[str] | None] = {}
+        for feed in FORECAST_FEEDS:
+            if feed in unchanged and (
+                bodies[feed] is None
+                or previous.regions[feed] is None
+                or (regions is not None and regions <= previous.regions[feed])
+            ):
+                self._meteo_fc_data[feed] = previous._meteo_fc_data[feed]
+                self.regions[feed] = previous.regions[feed]
+            else:
+                self._meteo_fc_data[feed] = self._timed_parse(
+                    feed,
+                    self._parse_forecast_data,
+                    bodies[feed],
+                    regions,
+                    FEED_URLS[feed],
+                )
+                self.regions[feed] = regions
+        self._meteo_fc_data_all = self._meteo_fc_data[FEED_FORECAST_3D]
+
+        self._build_catalogues()
+
+        # wall time of parsing, in seconds
+        self.parse_time = perf_counter() - start
+
+    def _timed_parse(self, feed: str, parse, body: bytes | None, *args):
+        """Return parse(body, *args), recording parse time of the feed."""
+        start = perf_counter()
+        parsed = parse(body, *args)
+        if body is not None:
+            self.parse_times[feed] = perf_counter() - start
+        return parsed
+
+    def row_counts(self) -> dict[str, int]:
+        """Return number of parsed records of each feed.
+
+        Records are stations for current and sea data, regions for daily
+        summaries and forecast points for forecasts.
+        """
+        return (
+            {
+                FEED_CURRENT: len(self._meteo_data_all),
+                FEED_SEA: len(self._meteo_sea_data_all),
+            }
+            | {feed: len(summaries) for feed, summaries in self._summaries.items()}
+            | {
+                feed: sum(len(series) for series in forecast.series.values())
+                for feed, forecast in self._meteo_fc_data.items()
+            }
+        )
+
+    def _build_catalogues(self) -> None:
+        """Build lists and spatial indexes of possible locations."""
+        self._locations = list(self._meteo_data_all)
+        self._sea_locations = list(self._meteo_sea_data_all)
+        self._location_index = DHMZSpatialIndex(
+            {
+                location: coordinates
+                for location in self._locations
+                if (coordinates := self.location_coordinates(location)) is not None
+            }
+        )
+        self._summary_indexes = {
+            feed: DHMZSpatialIndex(
+                {
+                    region: (summary["Lat"], summary["Lon"])
+                    for region, summary in summaries.items()
+                    # same point as its region, looked up by station name
+                    if region != SUMMARY_CITY
+                }
+            )
+            for feed, summaries in self._summaries.items()
+        }
+        self._sea_location_index = DHMZSpatialIndex(
+            {
+                location: SEA_LOCATION_COORDINATES[location]
+                for location in self._sea_locations
+                if location in SEA_LOCATION_COORDINATES
+            }
+        )
+
+    @staticmethod
+    def _parse_current_data(current_data: bytes | None) -> dict:
+        """Parse current meteo data (hrvatska_n.xml), indexed by station."""
+        meteo_data_all = {}
+        if current_data is None:
+            return meteo_data_all
         try:
             root = ET.fromstring(current_data)
-            for meteo_city_data in root.findall("Grad"):
-                meteo_data_location = {}
-                meteo_data_location["GradIme"] = meteo_city_data.find("GradIme").text
+            for meteo_city_data in root.iterfind("Grad"):
                 meteo_parent = meteo_city_data.find("Podatci")
-                for data in data_selection:
-                    meteo_data_location[data] = meteo_parent.find(data).text
-                self._meteo_data_all.append(meteo_data_location)
-        except ET.ParseError:
+                observation = DHMZObservation(
+                    name=_intern(meteo_city_data.findtext("GradIme")),
+                    latitude=_to_number(meteo_city_data.findtext("Lat")),
+                    longitude=_to_number(meteo_city_data.findtext("Lon")),
+                    temperature=_to_number(meteo_parent.findtext("Temp")),
+                    humidity=_to_number(meteo_parent.findtext("Vlaga")),
+                    pressure=_to_number(meteo_parent.findtext("Tlak")),
+                    wind_speed=_to_number(meteo_parent.findtext("VjetarBrzina")),
+                    wind_direction=_intern(meteo_parent.findtext("VjetarSmjer")),
+                    weather=_intern(meteo_parent.findtext("Vrijeme")),
+                    symbol=_intern(meteo_parent.findtext("VrijemeZnak")),
+                )
+                meteo_data_all.setdefault(observation.name, observation)
+        except (ET.ParseError, AttributeError):
             # log error, but don't fill data, should return None for all data
             LOGGER.error("Parse Error processing https://vrijeme.hr/hrvatska_n.xml @ ")
+            return {}
+        return meteo_data_all
 
-        # Sea temperature data -> _meteo_sea_data_all
+    @staticmethod
+    def _parse_sea_temp_data(sea_temp_data: bytes | None) -> dict:
+        """Parse sea temperature data (more_n.xml), indexed by station."""
+        meteo_sea_data_all = {}
+        if sea_temp_data is None:
+            return meteo_sea_data_all
         try:
             list_of_hours = []
+            time_table = DHMZTimeTable("%d.%m.%Y")
             root = ET.fromstring(sea_temp_data)
             sea_data_date = root.find("Datum").text
-            # LOGGER.debug("Datum: %s", str(sea_data_date))
-            for count_locations, meteo_sea_data in enumerate(root.findall("Podatci")):
+            for count_locations, meteo_sea_data in enumerate(root.iterfind("Podatci")):
                 if count_locations > 0:
-                    meteo_sea_data_location = {}
-                    for count, data in enumerate(meteo_sea_data):
-                        if count > 0:
-                            if data.text is not None:
-                                # only last Termin with value is used as this is dictonary
-                                if count <= len(list_of_hours):
-                                    meteo_sea_data_location[data.tag] = data.text
-                                    meteo_sea_data_location["datetime"] = list_of_hours[
-                                        count - 1
-                                    ]
-                        else:
-                            meteo_sea_data_location[data.tag] = data.text
-                    self._meteo_sea_data_all.append(meteo_sea_data_location)
+                    # only last Termin with value is used
+                    temperature = reading_time = None
+                    for data, hour in zip(
+                        meteo_sea_data.iterfind("Termin"), list_of_hours
+                    ):
+                        if (value := _to_number(data.text)) is not None:
+                            temperature, reading_time = value, hour
+                    reading = DHMZSeaReading(
+                        name=_intern(meteo_sea_data.findtext("Postaja")),
+                        temperature=temperature,
+                        time=reading_time,
+                    )
+                    meteo_sea_data_all.setdefault(reading.name, reading)
                 else:
-                    for count, data in enumerate(meteo_sea_data):
-                        if count > 0:
-                            list_of_hours.append(
-                                datetime.strptime(
-                                    (sea_data_date + " " + data.text + ":00 +0200"),
-                                    "%d.%m.%Y %H:%M %z",
-                                ).isoformat()
+                    for data in meteo_sea_data.iterfind("Termin"):
+                        list_of_hours.append(
+                            sys.intern(
+                                time_table.time(sea_data_date, data.text).isoformat()
                             )
-            # LOGGER.debug("list_of_hours: %s", list_of_hours)
-            # LOGGER.debug("All data: %s", self._meteo_sea_data_all)
-        except ET.ParseError:
+                        )
+        except (ET.ParseError, AttributeError):
             # log error, but don't fill data, should return None for all data
             LOGGER.error("Parse Error processing https://vrijeme.hr/more_n.xml")
+            return {}
+        return meteo_sea_data_all
+
+    @staticmethod
+    def _parse_summary_data(summary_data: bytes | None, url: str) -> dict:
+        """Parse regional daily summary (VW format), indexed by region.
+
+        Each region gets date, coordinates, its params (vrijeme - weather
+        symbol, Tmn / Tmx - min / max temperature as numbers, wind) and
+        forecast text (of Zagreb or of the whole country). Regions without
+        valid coordinates are left out, they could not be looked up anyway.
+        """
+        summaries = {}
+        if summary_data is None:
+            return summaries
+        try:
+            section = ET.fromstring(summary_data).find("section")
+            params = {
+                param.get("name"): param.get("value")
+                for param in section.iterfind("param")
+            }
+            date = datetime.strptime(params["datum"], "%d%m%y").date()
+            for station in section.iterfind("station"):
+                latitude = _to_number(station.get("lat"))
+                longitude = _to_number(station.get("lon"))
+                if latitude is None or longitude is None:
+                    LOGGER.debug(
+                        "Skipping %s of %s without coordinates",
+                        station.get("name"),
+                        url,
+                    )
+                    continue
+                summary = {
+                    "date": date.isoformat(),
+                    "Lat": latitude,
+                    "Lon": longitude,
+                    "text": params.get(
+                        "zg_text" if station.get("name") == SUMMARY_CITY else "rh_text"
+                    ),
+                }
+                for param in station.iterfind("param"):
+                    name = param.get("name")
+                    value = param.get("value")
+                    summary[name] = (
+                        _to_number(value) if name in SUMMARY_NUMBERS else value
+                    )
+                summaries[station.get("name")] = summary
+        except (ET.ParseError, AttributeError, KeyError, ValueError):
+            # log error, but don't fill data, should return None for all data
+            LOGGER.error("Parse Error processing %s", url)
+            return {}
+        return summaries
+
+    @staticmethod
+    def _parse_forecast_data(
+        forecast_data: bytes | None,
+        regions: frozenset[str] | None = None,
+        url: str = FEED_URLS[FEED_FORECAST_3D],
+    ) -> DHMZForecastData:
+        """Parse forecast data (3d_graf_i_simboli.xml or 7d_meteogrami.xml).
 
-        # 3 Days forecast data processing -> _meteo_fc_data_all
+        Data is parsed as a stream and processed elements are cleared right
+        away. Forecasts are kept only for regions (all if None), converted
+        to columns of numbers, for the rest just the region name is added
+        to the list of regions.
+        """
+        meteo_fc_data_all = DHMZForecastData()
+        if forecast_data is None:
+            return meteo_fc_data_all
         try:
-            root = ET.fromstring(forecast_data_3d)
-            for meteo_parent in root.findall("grad"):
+            # only end events are needed, each <grad> is complete at its end
+            for _, meteo_parent in ET.iterparse(BytesIO(forecast_data)):
+                if meteo_parent.tag != "grad":
+                    continue
                 city_name = meteo_parent.attrib["ime"]
-                for date_data in meteo_parent.findall("dan"):
-                    meteo_data_region = {}
-                    meteo_data_region["GradIme"] = city_name
-                    meteo_data_region["datum"] = date_data.attrib["datum"]
-                    meteo_data_region["sat"] = date_data.attrib["sat"]
-                    for data in data_fc_selection:
-                        meteo_data_region[data] = date_data.find(data).text
-                    self._meteo_fc_data_all.append(meteo_data_region)
+                if city_name not in meteo_fc_data_all.regions:
+                    meteo_fc_data_all.regions.append(city_name)
+                if regions is None or city_name in regions:
+                    series = meteo_fc_data_all.series.setdefault(
+                        city_name, DHMZForecastSeries()
+                    )
+                    for date_data in meteo_parent.iterfind("dan"):
+                        series.timestamps.append(
+                            meteo_fc_data_all.times.epoch(
+                                date_data.attrib["datum"], date_data.attrib["sat"]
+                            )
+                        )
+                        series.temperatures.append(
+                            _to_float(date_data.findtext("t_2m"))
+                        )
+                        series.precipitation.append(
+                            _to_float(date_data.findtext("oborina"))
+                        )
+                        series.symbols.append(
+                            meteo_fc_data_all.encode_symbol(
+                                date_data.findtext("simbol")
+                            )
+                        )
+                        series.winds.append(
+                            meteo_fc_data_all.encode_wind(date_data.findtext("vjetar"))
+                        )
+                # whole region is processed, drop its elements
+                meteo_parent.clear()
         except ET.ParseError:
             # log error, but don't fill data, should return None for all data
-            LOGGER.error(
-                "Parse Error processing https://prognoza.hr/tri/3d_graf_i_simboli.xml"
-            )
+            LOGGER.error("Parse Error processing %s", url)
+            return DHMZForecastData()
+        return meteo_fc_data_all
+
+    def as_dict(self) -> dict:
+        """Return JSON serializable form of the parsed data, for storage."""
+        return {
+            "updated": {
+                feed: updated.isoformat() for feed, updated in self.updated.items()
+            },
+            "digests": self.digests,
+            "regions": {
+                feed: None if regions is None else sorted(regions)
+                for feed, regions in self.regions.items()
+            },
+            "current": {
+                location: list(observation)
+                for location, observation in self._meteo_data_all.items()
+            },
+            "sea": {
+                location: list(reading)
+                for location, reading in self._meteo_sea_data_all.items()
+            },
+            "summaries": self._summaries,
+            "forecasts": {
+                feed: forecast.as_dict()
+                for feed, forecast in self._meteo_fc_data.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> DHMZMeteoData:
+        """Return snapshot restored from as_dict() form.
+
+        Restored feeds are all reported as stale until downloaded again.
+        """
+        updated = {
+            feed: datetime.fromisoformat(value)
+            for feed, value in data["updated"].items()
+        }
+        meteo_data = cls(None, None, updated=updated, stale_feeds=set(updated))
+        meteo_data.digests = dict(data["digests"])
+        meteo_data.regions = {
+            feed: None if regions is None else frozenset(regions)
+            for feed, regions in data["regions"].items()
+        }
+        meteo_data._meteo_data_all = {
+            sys.intern(location): DHMZObservation._make(values)
+            for location, values in data["current"].items()
+        }
+        meteo_data._meteo_sea_data_all = {
+            sys.intern(location): DHMZSeaReading._make(values)
+            for location, values in data["sea"].items()
+        }
+        meteo_data._summaries = data["summaries"]
+        meteo_data._meteo_fc_data = {
+            feed: DHMZForecastData.from_dict(forecast)
+            for feed, forecast in data["forecasts"].items()
+        }
+        meteo_data._meteo_fc_data_all = meteo_data._meteo_fc_data[FEED_FORECAST_3D]
+        meteo_data._build_catalogues()
+        return meteo_data
+
+    def feed_age(self, feed: str) -> timedelta | None:
+        """Return age of the feed data (None if it was never downloaded)."""
+        if (updated := self.updated.get(feed)) is None:
+            return None
+        return datetime.now(timezone.utc) - updated
 
-    def current_temperature(self, location: str) -> str:
+    def current_temperature(self, location: str) -> float | None:
         """Return temperature of the location."""
         return self.current_meteo_data(location, "Temp")
 
-    def current_humidity(self, location: str) -> float:
+    def current_humidity(self, location: str) -> float | None:
         """Return humidity of the location."""
-        humidity = self.current_meteo_data(location, "Vlaga")
-        return float(humidity) if humidity else None
+        return self.current_meteo_data(location, "Vlaga")
 
-    def current_air_pressure(self, location: str) -> str:
+    def current_air_pressure(self, location: str) -> float | None:
         """Return air pressure of the location."""
         return self.current_meteo_data(location, "Tlak")
 
     def _decode_meteo_condition(self, description: str) -> str:
         """Decode meteo condition to home assistant condition."""
-        try:
-            s_ret = [k for k, v in CONDITION_CLASSES.items() if description in v][0]
-            return s_ret
-        except IndexError:
+        condition = SYMBOL_CONDITIONS.get(description)
+        if condition is None:
             LOGGER.warning("Unknown DHMZ weather symbol: %s", description)
-            return None
+        return condition
 
     def current_condition(self, location: str) -> str:
         """Return current condition of the location."""
@@ -259,15 +871,13 @@ class DHMZMeteoData:
             self.current_meteo_data(location, "VrijemeZnak")
         )
 
-    def current_wind_direction(self, location: str) -> str:
+    def current_wind_direction(self, location: str) -> str | None:
         """Return current wind direction."""
-        wind_dir = self.current_meteo_data(location, "VjetarSmjer")
-        return str(wind_dir) if wind_dir else None
+        return self.current_meteo_data(location, "VjetarSmjer") or None
 
-    def current_wind_speed(self, location: str) -> float:
+    def current_wind_speed(self, location: str) -> float | None:
         """Return current wind speed."""
-        wind_speed = self.current_meteo_data(location, "VjetarBrzina")
-        return float(wind_speed) if wind_speed else None
+        return self.current_meteo_data(location, "VjetarBrzina")
 
     # def current_precipitation(self, location: str) -> float:
     #    """Return current precipitation."""
@@ -279,63 +889,140 @@ class DHMZMeteoData:
     #    visibility = self.current_meteo_data(location, "vis_val")
     #    return float(visibility) if visibility else None
 
-    def current_meteo_data(self, location: str, data_type: str) -> str:
-        """Return data_type of the location."""
-        meteo_data_location = next(
-            (item for item in self._meteo_data_all if item["GradIme"] == location),
-            None,
-        )
-        return None if meteo_data_location is None else meteo_data_location[data_type]
+    def current_observation(self, location: str) -> DHMZObservation | None:
+        """Return current data record of the location."""
+        return self._meteo_data_all.get(location)
 
-    def current_sea_temp_data(self, location: str, data_type: str) -> str:
-        """Return sea temperature of the location."""
-        meteo_data_location = next(
-            (item for item in self._meteo_sea_data_all if item["Postaja"] == location),
-            None,
-        )
-        # LOGGER.debug("current_sea_temp_data: %s", meteo_data_location[data_type])
-        return None if meteo_data_location is None else meteo_data_location[data_type]
+    def current_sea_reading(self, location: str) -> DHMZSeaReading | None:
+        """Return sea temperature record of the location."""
+        return self._meteo_sea_data_all.get(location)
+
+    def current_meteo_data(self, location: str, data_type: str) -> float | str | None:
+        """Return data_type (feed element, e.g. "Temp") of the location."""
+        meteo_data_location = self._meteo_data_all.get(location)
+        if meteo_data_location is None:
+            return None
+        return getattr(meteo_data_location, OBSERVATION_FIELDS[data_type])
+
+    def current_sea_temp_data(
+        self, location: str, data_type: str
+    ) -> float | str | None:
+        """Return data_type (feed element "Termin" or "datetime") of sea station."""
+        meteo_data_location = self._meteo_sea_data_all.get(location)
+        if meteo_data_location is None:
+            return None
+        return getattr(meteo_data_location, SEA_READING_FIELDS[data_type])
 
     def list_of_locations(self) -> list:
         """Return list of possible locations."""
-        list_of_locations = []
-        for meteo_data_location in self._meteo_data_all:
-            # LOGGER.debug("Location : %s", meteo_data_location["GradIme"])
-            list_of_locations.append(meteo_data_location["GradIme"])
-        return list_of_locations
-
-    def list_of_forecast_regions(self) -> list:
-        """Return list of possible forecast regions."""
-        list_of_regions = []
-        # Read list of regions for meteo.hr
-        for meteo_data_region in self._meteo_fc_data_all:
-            list_of_regions.append(meteo_data_region["GradIme"])
-        return list(set(list_of_regions))  # Using set to remove duplicate entries
+        return self._locations
+
+    def location_coordinates(self, location: str) -> tuple[float, float] | None:
+        """Return (latitude, longitude) of the station, None if unknown."""
+        meteo_data = self._meteo_data_all.get(location)
+        if meteo_data is None or None in (meteo_data.latitude, meteo_data.longitude):
+            return None
+        return (meteo_data.latitude, meteo_data.longitude)
+
+    def nearest_locations(
+        self, latitude: float, longitude: float, count: int = 1
+    ) -> list[tuple[str, float]]:
+        """Return count nearest stations as (name, distance in km)."""
+        return self._location_index.nearest(latitude, longitude, count)
+
+    def interpolate(
+        self, points: dict[str, tuple[float, float]]
+    ) -> dict[str, dict[str, float | None]]:
+        """Return current data of virtual stations at points.
+
+        Values are inverse distance weighted (power 2) averages of the
+        nearest stations, stations missing the value are skipped.
+        points maps name -> (latitude, longitude), result name -> data type
+        -> value (None if no nearby station has it).
+        """
+        virtual_data = {}
+        for name, (latitude, longitude) in points.items():
+            nearest = [
+                (self._meteo_data_all[location], distance)
+                for location, distance in self._location_index.nearest(
+                    latitude, longitude, INTERPOLATION_STATIONS
+                )
+            ]
+            values = virtual_data[name] = {}
+            for data_type in INTERPOLATED_TYPES:
+                field = OBSERVATION_FIELDS[data_type]
+                total = weights = 0.0
+                for meteo_data, distance in nearest:
+                    if (value := getattr(meteo_data, field)) is None:
+                        continue
+                    if distance < 0.01:
+                        # point is at the station
+                        total, weights = value, 1.0
+                        break
+                    total += value / distance**2
+                    weights += 1 / distance**2
+                values[data_type] = round(total / weights, 1) if weights else None
+        return virtual_data
+
+    def nearest_sea_locations(
+        self, latitude: float, longitude: float, count: int = 1
+    ) -> list[tuple[str, float]]:
+        """Return count nearest sea stations as (name, distance in km)."""
+        return self._sea_location_index.nearest(latitude, longitude, count)
+
+    def daily_summary(
+        self,
+        feed: str,
+        latitude: float,
+        longitude: float,
+        location: str | None = None,
+    ) -> dict | None:
+        """Return daily summary (of summary feed) for the point.
+
+        Stations of the summary city (location named like "Zagreb-Maksimir")
+        get summary of the city, the others of the region nearest to the point.
+        """
+        summaries = self._summaries[feed]
+        if (
+            location is not None
+            and re.split(r"[- ]", location)[0] == SUMMARY_CITY
+            and SUMMARY_CITY in summaries
+        ):
+            return {"region": SUMMARY_CITY} | summaries[SUMMARY_CITY]
+        if not (nearest := self._summary_indexes[feed].nearest(latitude, longitude)):
+            return None
+        region = nearest[0][0]
+        return {"region": region} | summaries[region]
+
+    def list_of_forecast_regions(self, feed: str = FEED_FORECAST_3D) -> list:
+        """Return list of possible forecast regions (of the forecast feed)."""
+        return self._meteo_fc_data[feed].regions
 
     def list_of_sea_locations(self) -> list:
         """Return list of possible sea temperature locations."""
-        list_of_sea_locations = []
-        # Read list of regions for meteo.hr
-        for meteo_data_sea_location in self._meteo_sea_data_all:
-            list_of_sea_locations.append(meteo_data_sea_location["Postaja"])
-        return list_of_sea_locations
+        return self._sea_locations
+
+    def fc_series(
+        self, region: str, feed: str = FEED_FORECAST_3D
+    ) -> DHMZForecastSeries | None:
+        """Return forecast series of the region."""
+        return self._meteo_fc_data[feed].series.get(region)
+
+    def fc_conditions(self, feed: str = FEED_FORECAST_3D) -> list:
+        """Return table of conditions, indexed by encoded forecast symbols."""
+        return self._meteo_fc_data[feed].conditions
+
+    def fc_times(self, feed: str = FEED_FORECAST_3D) -> dict:
+        """Return table of forecast times, indexed by epoch seconds."""
+        return self._meteo_fc_data[feed].times.times
 
     def fc_list_of_dates(self, region) -> list:
         """Return list of dates in the forecast data."""
-        decoded_dates = []
-        raw_list_of_dates = []
-        # raw_list_of_dates = self.fc_list_of_meteo_data(region, "datum")
-        list_of_dates = self.fc_list_of_meteo_data(region, "datum")
-        list_of_times = self.fc_list_of_meteo_data(region, "sat")
-        for date in zip(list_of_dates, list_of_times):
-            raw_list_of_dates.append(date[0] + " " + date[1] + ":00 +0200")
-        # LOGGER.debug("ListOfDates: %s", str(raw_list_of_dates))
-        for date in raw_list_of_dates:
-            decoded_dates.append(
-                datetime.strptime(date, "%d.%m.%Y. %H:%M %z").isoformat()
-            )
-        # LOGGER.debug("ListOfDecodedDates: %s", str(decoded_dates))
-        return decoded_dates
+        times = self.fc_times()
+        return [
+            times[timestamp].isoformat()
+            for timestamp in self.fc_list_of_meteo_data(region, "timestamps")
+        ]
 
     def fc_list_of_min_temps(self, region) -> list:
         """Return list of temperatures in the forecast data."""
@@ -351,11 +1038,11 @@ class DHMZMeteoData:
 
     def fc_list_of_condtions(self, region) -> list:
         """Return list of dates in the forecast data."""
-        decoded_conditions = []
-        raw_list_of_conditions = self.fc_list_of_meteo_data(region, "simbol")
-        for condition in raw_list_of_conditions:
-            decoded_conditions.append(self._decode_meteo_condition(condition))
-        return decoded_conditions
+        conditions = self._meteo_fc_data_all.conditions
+        return [
+            conditions[symbol]
+            for symbol in self.fc_list_of_meteo_data(region, "simbol_code")
+        ]
 
     # def fc_list_of_humidities(self, region) -> list:
     #    """Return list of humidities in the forecast data."""
@@ -383,13 +1070,114 @@ class DHMZMeteoData:
 
     def fc_list_of_meteo_data(self, region: str, data_type: str) -> list:
         """Return list of forcast data for specific region."""
-        meteo_data_region = []
-        regional_fc_data = [
-            item for item in self._meteo_fc_data_all if item["GradIme"] == region
-        ]
-        for data in regional_fc_data:
-            meteo_data_region.append(data[data_type])
-        return meteo_data_region
+        series = self._meteo_fc_data_all.series.get(region)
+        if series is None:
+            return []
+        if data_type == "simbol":
+            return [self._meteo_fc_data_all.symbols[code] for code in series.symbols]
+        if data_type == "vjetar":
+            return [self._meteo_fc_data_all.winds[code] for code in series.winds]
+        return list(getattr(series, FORECAST_COLUMNS[data_type]))
+
+
+class DHMZFeedCache:
+    """Last response of a feed, used for conditional requests."""
+
+    def __init__(
+        self,
+        etag: str | None,
+        last_modified: str | None,
+        body: bytes,
+        fetched: datetime,
+    ) -> None:
+        """Initialize feed cache."""
+        self.etag = etag
+        self.last_modified = last_modified
+        self.body = body
+        self.fetched = fetched
+
+
+class DHMZCircuitBreaker:
+    """Circuit breaker of a host.
+
+    After CIRCUIT_FAILURE_THRESHOLD failed fetches in a row the circuit
+    opens and requests to the host are refused. When the open time passes
+    a single trial request is let through (half open): its success closes
+    the circuit, its failure opens it again for twice as long.
+    """
+
+    def __init__(self, host: str) -> None:
+        """Initialize closed circuit."""
+        self.host = host
+        self.failures = 0
+        self.open_time = CIRCUIT_OPEN_TIME
+        self._open_until: float | None = None
+        self._half_open = False
+
+    @property
+    def state(self) -> str:
+        """Return "closed", "open" or "half_open"."""
+        if self._open_until is None:
+            return "closed"
+        return "half_open" if self._half_open else "open"
+
+    def allow(self) -> bool:
+        """Return True if a request to the host may be sent now."""
+        if self._open_until is None:
+            return True
+        if monotonic() < self._open_until:
+            return False
+        # trial request, others wait for its result (or CIRCUIT_TRIAL_TIME)
+        self._half_open = True
+        self._open_until = monotonic() + CIRCUIT_TRIAL_TIME
+        return True
+
+    def record_success(self) -> None:
+        """Close the circuit."""
+        if self._open_until is not None:
+            LOGGER.info("Circuit of %s closed, host responds again", self.host)
+        self.failures = 0
+        self.open_time = CIRCUIT_OPEN_TIME
+        self._open_until = None
+        self._half_open = False
+
+    def record_failure(self) -> None:
+        """Count failed fetch, open the circuit after too many of them."""
+        self.failures += 1
+        if self._half_open:
+            self.open_time = min(2 * self.open_time, CIRCUIT_OPEN_TIME_MAX)
+        elif self._open_until is None and self.failures < CIRCUIT_FAILURE_THRESHOLD:
+            return
+        LOGGER.warning(
+            "Circuit of %s opened for %d s after %d failures",
+            self.host,
+            self.open_time,
+            self.failures,
+        )
+        self._open_until = monotonic() + self.open_time
+        self._half_open = False
+
+    def as_dict(self) -> dict:
+        """Return JSON serializable state, for diagnostics."""
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "open_time": self.open_time,
+            "open_for": None
+            if self._open_until is None
+            else max(0.0, self._open_until - monotonic()),
+        }
+
+
+def _is_transient(exception: DHMZApiClientCommunicationError) -> bool:
+    """Return True if the failed request is worth retrying."""
+    if isinstance(exception, DHMZApiClientCircuitOpenError):
+        return False
+    cause = exception.__cause__
+    if isinstance(cause, aiohttp.ClientResponseError):
+        # server errors and rate limiting, other responses won't change
+        return cause.status >= 500 or cause.status == 429
+    return True
 
 
 class DHMZApiClient:
@@ -398,27 +1186,150 @@ class DHMZApiClient:
     def __init__(
         self,
         session: aiohttp.ClientSession,
+        telemetry: DHMZTelemetry | None = None,
     ) -> None:
-        """Sample API Client."""
+        """Sample API Client.
+
+        DNS and connect times are recorded in telemetry only if session was
+        created with its trace_config().
+        """
         self._session = session
+        self.telemetry = telemetry or DHMZTelemetry()
+        self.circuit_breakers: dict[str, DHMZCircuitBreaker] = {}
+        self._feed_cache: dict[str, DHMZFeedCache] = {}
+        self._data: DHMZMeteoData | None = None
+        # feeds served from the restored snapshot, not downloaded since
+        self._restored_feeds: set[str] = set()
+        self._build_lock = asyncio.Lock()
 
-    async def async_get_data(self) -> any:
-        """Get data from the API."""
-        meteo_data_xml = await self._api_wrapper(
-            method="get",
-            url="https://vrijeme.hr/hrvatska_n.xml",
-        )
-        meteo_forecast_xml = await self._api_wrapper(
-            method="get",
-            url="https://prognoza.hr/tri/3d_graf_i_simboli.xml",
-        )
-        meteo_sea_temp_xml = await self._api_wrapper(
-            method="get",
-            url="https://vrijeme.hr/more_n.xml",
-        )
-        return DHMZMeteoData(
-            meteo_data_xml, meteo_forecast_xml, sea_temp_data=meteo_sea_temp_xml
+    @property
+    def data(self) -> DHMZMeteoData | None:
+        """Return the last built snapshot (None before the first fetch)."""
+        return self._data
+
+    def restore(self, data: DHMZMeteoData) -> None:
+        """Use restored snapshot until the feeds are downloaded again."""
+        if self._data is None:
+            self._data = data
+            self._restored_feeds = set(data.updated)
+
+    async def async_get_data(
+        self,
+        feeds: Iterable[str] | None = None,
+        regions: Iterable[str] | None = None,
+    ) -> any:
+        """Get data from the API.
+
+        Only given feeds (all by default) are downloaded, the others are taken
+        from the last responses or the restored snapshot. Forecasts are parsed
+        only for given regions (all by default). Feeds are fetched concurrently.
+        If some of them fail, the last good copy of those feeds is used (while
+        not older than STALE_DATA_MAX_AGE, restored feeds however old they
+        are until downloaded) and they are reported as stale.
+        Transient errors are retried with backoff, while the circuit of the
+        host is open feeds are not requested at all and handled the same way.
+        """
+        feeds = list(FEED_URLS if feeds is None else feeds)
+        results = await asyncio.gather(
+            *(self._async_fetch(feed) for feed in feeds),
+            return_exceptions=True,
         )
+        errors = {}
+        for feed, result in zip(feeds, results):
+            if not isinstance(result, BaseException):
+                continue
+            # last good copy is either in the feed cache or in restored data
+            age = None if self._data is None else self._data.feed_age(feed)
+            if (
+                not isinstance(result, DHMZApiClientError)
+                or isinstance(result, DHMZApiClientAuthenticationError)
+                or age is None
+                or (age > STALE_DATA_MAX_AGE and feed not in self._restored_feeds)
+            ):
+                raise result
+            LOGGER.warning(
+                "Error fetching %s, using data from %s: %s",
+                FEED_URLS[feed],
+                self._data.updated[feed],
+                result,
+            )
+            errors[feed] = result
+
+        # Successful responses are stored in the feed cache as well
+        # Parsing is done in executor so it doesn't block the event loop,
+        # snapshots are built one at a time so each one builds on the last.
+        async with self._build_lock:
+            cached = {
+                feed: self._feed_cache[url]
+                for feed, url in FEED_URLS.items()
+                if url in self._feed_cache
+            }
+            bodies = {feed: cache.body for feed, cache in cached.items()}
+            # feeds not requested now stay stale until they are fetched again
+            stale_feeds = set(errors)
+            if self._data is not None:
+                stale_feeds |= self._data.stale_feeds.difference(feeds)
+            self._data = await asyncio.get_running_loop().run_in_executor(
+                None,
+                partial(
+                    DHMZMeteoData,
+                    bodies.get(FEED_CURRENT),
+                    bodies.get(FEED_FORECAST_3D),
+                    forecast_data_7d=bodies.get(FEED_FORECAST_7D),
+                    forecast_data_today=bodies.get(FEED_SUMMARY_TODAY),
+                    forecast_data_tomorrow=bodies.get(FEED_SUMMARY_TOMORROW),
+                    sea_temp_data=bodies.get(FEED_SEA),
+                    previous=self._data,
+                    updated={feed: cache.fetched for feed, cache in cached.items()},
+                    stale_feeds=stale_feeds,
+                    regions=regions,
+                ),
+            )
+        self._restored_feeds.difference_update(set(feeds).difference(errors))
+        row_counts = self._data.row_counts()
+        for feed, parse_time in self._data.parse_times.items():
+            telemetry = self.telemetry.feed(feed)
+            telemetry.parse.add(parse_time)
+            telemetry.rows = row_counts[feed]
+        for feed in set(feeds).difference(errors, self._data.parse_times):
+            self.telemetry.feed(feed).reused += 1
+        LOGGER.debug("DHMZ data parsed in %.3f s", self._data.parse_time)
+        return self._data
+
+    async def _async_fetch(self, feed: str) -> bytes:
+        """Get the feed, retrying transient errors, through circuit of its host."""
+        url = FEED_URLS[feed]
+        telemetry = self.telemetry.feed(feed)
+        host = urlsplit(url).hostname
+        if (breaker := self.circuit_breakers.get(host)) is None:
+            breaker = self.circuit_breakers[host] = DHMZCircuitBreaker(host)
+        if not breaker.allow():
+            telemetry.rejected += 1
+            raise DHMZApiClientCircuitOpenError(f"Circuit of {host} is open")
+        delay = RETRY_DELAY
+        for attempt in range(1, RETRY_ATTEMPTS + 1):
+            try:
+                body = await self._api_wrapper(
+                    method="get", url=url, telemetry=telemetry
+                )
+            except DHMZApiClientCommunicationError as exception:
+                if not _is_transient(exception):
+                    raise
+                if attempt == RETRY_ATTEMPTS:
+                    breaker.record_failure()
+                    raise
+                LOGGER.debug(
+                    "Error fetching %s (attempt %d), retrying: %s",
+                    url,
+                    attempt,
+                    exception,
+                )
+                telemetry.retries += 1
+                await asyncio.sleep(delay * uniform(0.5, 1.5))
+                delay = min(2 * delay, RETRY_DELAY_MAX)
+            else:
+                breaker.record_success()
+                return body
 
     async def _api_wrapper(
         self,
@@ -426,30 +1337,95 @@ class DHMZApiClient:
         url: str,
         data: dict | None = None,
         headers: dict | None = None,
+        telemetry: DHMZFeedTelemetry | None = None,
     ) -> any:
-        """Get information from the API."""
+        """Get information from the API.
+
+        GET requests are conditional, when server responds with
+        304 Not Modified the previously received body is returned.
+        Body is returned as received (bytes, XML declares its encoding),
+        responses larger than RESPONSE_SIZE_MAX are refused.
+        Request times, sizes and errors are recorded in telemetry.
+        """
+        telemetry = telemetry or DHMZFeedTelemetry()
+        telemetry.requests += 1
+        start = perf_counter()
+        headers = {aiohttp.hdrs.ACCEPT_ENCODING: ACCEPT_ENCODING} | (headers or {})
+        cache = self._feed_cache.get(url) if method == "get" else None
+        if cache is not None:
+            if cache.etag:
+                headers[aiohttp.hdrs.IF_NONE_MATCH] = cache.etag
+            if cache.last_modified:
+                headers[aiohttp.hdrs.IF_MODIFIED_SINCE] = cache.last_modified
         try:
-            async with async_timeout.timeout(10):
-                response = await self._session.request(
+            async with (
+                async_timeout.timeout(10),
+                self._session.request(
                     method=method,
                     url=url,
                     headers=headers,
                     json=data,
-                )
+                    trace_request_ctx=telemetry,
+                ) as response,
+            ):
+                headers_received = perf_counter()
+                telemetry.wait.add(headers_received - start)
                 if response.status in (401, 403):
                     raise DHMZApiClientAuthenticationError(
                         "Invalid credentials",
                     )
+                if response.status == 304 and cache is not None:
+                    LOGGER.debug("%s not modified", url)
+                    telemetry.not_modified += 1
+                    telemetry.fetch.add(perf_counter() - start)
+                    cache.fetched = datetime.now(timezone.utc)
+                    return cache.body
                 response.raise_for_status()
-                return await response.text()
+                if (response.content_length or 0) > RESPONSE_SIZE_MAX:
+                    raise DHMZApiClientResponseTooLargeError(
+                        f"Response of {response.content_length} bytes refused"
+                    )
+                # content is decompressed while read, so its size is checked too
+                chunks = []
+                size = 0
+                async for chunk in response.content.iter_chunked(RESPONSE_CHUNK_SIZE):
+                    size += len(chunk)
+                    if size > RESPONSE_SIZE_MAX:
+                        raise DHMZApiClientResponseTooLargeError(
+                            f"Response over {RESPONSE_SIZE_MAX} bytes refused"
+                        )
+                    chunks.append(chunk)
+                body = b"".join(chunks)
+                finished = perf_counter()
+                telemetry.transfer.add(finished - headers_received)
+                telemetry.fetch.add(finished - start)
+                telemetry.bytes_received += size
+                if aiohttp.hdrs.CONTENT_ENCODING in response.headers:
+                    telemetry.compressed += 1
+                if method == "get":
+                    self._feed_cache[url] = DHMZFeedCache(
+                        etag=response.headers.get(aiohttp.hdrs.ETAG),
+                        last_modified=response.headers.get(
+                            aiohttp.hdrs.LAST_MODIFIED
+                        ),
+                        body=body,
+                        fetched=datetime.now(timezone.utc),
+                    )
+                return body
 
+        except DHMZApiClientError as exception:
+            telemetry.record_error(exception)
+            raise
         except asyncio.TimeoutError as exception:
+            telemetry.record_error(exception)
             raise DHMZApiClientCommunicationError(
                 "Timeout error fetching information",
             ) from exception
         except (aiohttp.ClientError, socket.gaierror) as exception:
+            telemetry.record_error(exception)
             raise DHMZApiClientCommunicationError(
                 "Error fetching information",
             ) from exception
         except Exception as exception:  # pylint: disable=broad-except
+            telemetry.record_error(exception)
             raise DHMZApiClientError("Something really wrong happened!") from exception
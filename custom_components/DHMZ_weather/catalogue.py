@@ -0,0 +1,204 @@
+"""Catalogue of DHMZ stations and forecast regions.
+
+A catalogue compiled from the feeds is shipped with the integration
+(catalogue.json, regenerate it with scripts/catalogue), so the config flow
+can list the choices without downloading the feeds. Names found later in
+downloaded feeds are merged in and kept in Home Assistant storage.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import unicodedata
+from pathlib import Path
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .api import SEA_LOCATION_COORDINATES, DHMZMeteoData
+from .const import (
+    CONF_LOCATION,
+    CONF_REGION,
+    CONF_SEA_LOCATION,
+    DATA_CATALOGUE,
+    DOMAIN,
+    FEED_FORECAST_7D,
+    LOGGER,
+)
+from .spatial import DHMZSpatialIndex
+
+CATALOGUE_FILE = Path(__file__).parent / "catalogue.json"
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.catalogue"
+
+# number of nearest stations whose names are tried as forecast region
+REGION_CANDIDATES = 5
+
+
+def _region_names(location: str) -> list[str]:
+    """Return forecast region names possibly matching the station name.
+
+    Regions are named like stations, but in ASCII with underscores, e.g.
+    "Slavonski Brod" -> "Slavonski_Brod", "Split-Marjan" -> "Split".
+    """
+    name = unicodedata.normalize("NFKD", location).encode("ascii", "ignore").decode()
+    name = re.sub(r"^(RC|NP) |\s*\(.*\)$", "", name)
+    return [name.replace(" ", "_"), re.split(r"[- ]", name)[0]]
+
+
+class DHMZCatalogue:
+    """Known stations (with coordinates), forecast regions and sea stations.
+
+    Extended regions are regions of the 7 days forecast, named mostly (but
+    not always) like the 3 days forecast regions.
+    """
+
+    def __init__(
+        self,
+        locations: dict[str, tuple[float, float] | None],
+        regions: list[str],
+        sea_locations: list[str],
+        extended_regions: list[str],
+    ) -> None:
+        """Initialize catalogue."""
+        self.locations = locations
+        self.regions = regions
+        self.sea_locations = sea_locations
+        self.extended_regions = extended_regions
+        self._indexes: tuple[DHMZSpatialIndex, DHMZSpatialIndex] | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> DHMZCatalogue:
+        """Return catalogue from its JSON form."""
+        return cls(
+            locations={
+                name: None if coordinates is None else tuple(coordinates)
+                for name, coordinates in data["locations"].items()
+            },
+            regions=list(data["regions"]),
+            sea_locations=list(data["sea_locations"]),
+            # missing in catalogues stored by older versions
+            extended_regions=list(data.get("extended_regions", [])),
+        )
+
+    def as_dict(self) -> dict:
+        """Return JSON serializable form of the catalogue."""
+        return {
+            "locations": self.locations,
+            "regions": self.regions,
+            "sea_locations": self.sea_locations,
+            "extended_regions": self.extended_regions,
+        }
+
+    @classmethod
+    def from_meteo_data(cls, meteo_data: DHMZMeteoData) -> DHMZCatalogue:
+        """Return catalogue of names found in the snapshot."""
+        return cls(
+            locations={
+                location: meteo_data.location_coordinates(location)
+                for location in meteo_data.list_of_locations()
+            },
+            regions=list(meteo_data.list_of_forecast_regions()),
+            sea_locations=list(meteo_data.list_of_sea_locations()),
+            extended_regions=list(
+                meteo_data.list_of_forecast_regions(FEED_FORECAST_7D)
+            ),
+        )
+
+    def merge(self, other: DHMZCatalogue) -> bool:
+        """Add names (and coordinates) of other, return True if anything changed."""
+        changed = False
+        for location, coordinates in other.locations.items():
+            if coordinates is None and location in self.locations:
+                continue
+            if self.locations.get(location, ()) != coordinates:
+                self.locations[location] = coordinates
+                changed = True
+        for known, names in (
+            (self.regions, other.regions),
+            (self.sea_locations, other.sea_locations),
+            (self.extended_regions, other.extended_regions),
+        ):
+            new_names = [name for name in names if name not in known]
+            known.extend(new_names)
+            changed = changed or bool(new_names)
+        if changed:
+            self._indexes = None
+        return changed
+
+    def nearest(self, latitude: float, longitude: float) -> dict[str, str]:
+        """Return station, forecast region and sea station nearest to the point.
+
+        Forecast regions have no coordinates, region named as one of the
+        nearest stations is used. Keys are config entry options, those
+        without a match are left out.
+        """
+        if self._indexes is None:
+            self._indexes = (
+                DHMZSpatialIndex(
+                    {
+                        location: coordinates
+                        for location, coordinates in self.locations.items()
+                        if coordinates is not None
+                    }
+                ),
+                DHMZSpatialIndex(
+                    {
+                        location: SEA_LOCATION_COORDINATES[location]
+                        for location in self.sea_locations
+                        if location in SEA_LOCATION_COORDINATES
+                    }
+                ),
+            )
+        location_index, sea_location_index = self._indexes
+        nearest = {}
+        locations = location_index.nearest(latitude, longitude, REGION_CANDIDATES)
+        if locations:
+            nearest[CONF_LOCATION] = locations[0][0]
+        regions = {region.casefold(): region for region in self.regions}
+        for location, _ in locations:
+            names = [name.casefold() for name in _region_names(location)]
+            if (name := next((n for n in names if n in regions), None)) is not None:
+                nearest[CONF_REGION] = regions[name]
+                break
+        if sea_locations := sea_location_index.nearest(latitude, longitude):
+            nearest[CONF_SEA_LOCATION] = sea_locations[0][0]
+        return nearest
+
+
+def _load_bundled_catalogue() -> DHMZCatalogue:
+    """Load catalogue shipped with the integration (blocking)."""
+    with CATALOGUE_FILE.open(encoding="utf-8") as catalogue_file:
+        return DHMZCatalogue.from_dict(json.load(catalogue_file))
+
+
+def _get_store(hass: HomeAssistant) -> Store:
+    """Return store of the names merged into the catalogue."""
+    return Store(hass, STORAGE_VERSION, STORAGE_KEY)
+
+
+async def async_get_catalogue(hass: HomeAssistant) -> DHMZCatalogue:
+    """Return the catalogue, loading bundled and stored names on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (catalogue := domain_data.get(DATA_CATALOGUE)) is None:
+        catalogue = await hass.async_add_executor_job(_load_bundled_catalogue)
+        try:
+            if (stored := await _get_store(hass).async_load()) is not None:
+                catalogue.merge(DHMZCatalogue.from_dict(stored))
+        except (KeyError, TypeError, ValueError) as exception:
+            LOGGER.warning("Ignoring invalid stored DHMZ catalogue: %s", exception)
+        catalogue = domain_data.setdefault(DATA_CATALOGUE, catalogue)
+    return catalogue
+
+
+async def async_update_catalogue(
+    hass: HomeAssistant, meteo_data: DHMZMeteoData
+) -> DHMZCatalogue:
+    """Merge names found in the snapshot into the catalogue and store them."""
+    catalogue = await async_get_catalogue(hass)
+    if catalogue.merge(DHMZCatalogue.from_meteo_data(meteo_data)):
+        LOGGER.debug("DHMZ catalogue updated with new names")
+        await _get_store(hass).async_save(catalogue.as_dict())
+    return catalogue
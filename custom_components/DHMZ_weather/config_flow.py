@@ -2,19 +2,43 @@
 
 from __future__ import annotations
 
+import asyncio
+from datetime import timedelta
+
 import voluptuous as vol
 from homeassistant import config_entries
+from homeassistant.core import callback
 from homeassistant.helpers import selector
-from homeassistant.helpers.aiohttp_client import async_create_clientsession
 
 from .api import (
-    DHMZApiClient,
     DHMZApiClientAuthenticationError,
     DHMZApiClientCommunicationError,
     DHMZApiClientError,
-    DHMZMeteoData,
 )
-from .const import DOMAIN, LOGGER, CONF_LOCATION, CONF_REGION, CONF_SEA_LOCATION
+from .catalogue import async_get_catalogue, async_update_catalogue
+from .const import (
+    DOMAIN,
+    LOGGER,
+    CONF_LOCATION,
+    CONF_REGION,
+    CONF_SEA_LOCATION,
+    CONF_VIRTUAL_STATION,
+    CONF_MAX_SILENCE,
+    CONF_MIN_WRITE_INTERVAL,
+    DEFAULT_MAX_SILENCE,
+    DEFAULT_MIN_WRITE_INTERVAL,
+    FEED_CURRENT,
+    FEED_FORECAST_3D,
+    FEED_SEA,
+    FEED_UPDATE_INTERVALS,
+    SENSOR_DEADBANDS,
+)
+from .hub import async_get_hub
+
+# feeds listing the choices, downloaded within this time are not downloaded
+# again by the flow
+CATALOGUE_FEEDS = (FEED_CURRENT, FEED_FORECAST_3D, FEED_SEA)
+CATALOGUE_MAX_AGE = timedelta(minutes=5)
 
 
 class DHMZFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
@@ -22,6 +46,14 @@ class DHMZFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> config_entries.OptionsFlow:
+        """Get the options flow for this handler."""
+        return DHMZOptionsFlowHandler(config_entry)
+
     async def async_step_user(
         self,
         user_input: dict | None = None,
@@ -29,15 +61,10 @@ class DHMZFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         """Handle a flow initialized by the user."""
         _errors = {}
 
-        # Get list of locations to choose from.
-        list_of_locations = await self._return_locations()
-        list_of_regions = await self._return_regions()
-        list_of_sea_locations = await self._return_sea_locations()
-
         # Present settings UI.
         if user_input is not None:
             try:
-                await self._test_connecton()
+                await self._async_refresh_catalogue()
             except DHMZApiClientAuthenticationError as exception:
                 LOGGER.warning(exception)
                 _errors["base"] = "auth"
@@ -52,26 +79,50 @@ class DHMZFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
                     title=user_input[CONF_LOCATION],
                     data=user_input,
                 )
+        else:
+            # Feeds are downloaded while the user fills in the form.
+            self.hass.async_create_background_task(
+                self._async_refresh_catalogue_quietly(),
+                f"{DOMAIN} catalogue refresh",
+            )
+
+        # Get list of locations to choose from.
+        catalogue = await async_get_catalogue(self.hass)
+        list_of_locations = list(catalogue.locations)
+        list_of_regions = catalogue.regions
+        list_of_sea_locations = catalogue.sea_locations
+        # Preselect stations nearest to home.
+        defaults = catalogue.nearest(
+            self.hass.config.latitude, self.hass.config.longitude
+        )
 
         return self.async_show_form(
             step_id="user",
             data_schema=vol.Schema(
                 {
-                    vol.Required(CONF_LOCATION): selector.SelectSelector(
+                    vol.Required(
+                        CONF_LOCATION,
+                        default=defaults.get(CONF_LOCATION, vol.UNDEFINED),
+                    ): selector.SelectSelector(
                         selector.SelectSelectorConfig(
                             options=list_of_locations,
                             mode=selector.SelectSelectorMode.DROPDOWN,
                             sort=True,
                         ),
                     ),
-                    vol.Required(CONF_REGION): selector.SelectSelector(
+                    vol.Required(
+                        CONF_REGION, default=defaults.get(CONF_REGION, vol.UNDEFINED)
+                    ): selector.SelectSelector(
                         selector.SelectSelectorConfig(
                             options=list_of_regions,
                             mode=selector.SelectSelectorMode.DROPDOWN,
                             sort=True,
                         ),
                     ),
-                    vol.Required(CONF_SEA_LOCATION): selector.SelectSelector(
+                    vol.Required(
+                        CONF_SEA_LOCATION,
+                        default=defaults.get(CONF_SEA_LOCATION, vol.UNDEFINED),
+                    ): selector.SelectSelector(
                         selector.SelectSelectorConfig(
                             options=list_of_sea_locations,
                             mode=selector.SelectSelectorMode.DROPDOWN,
@@ -83,36 +134,112 @@ class DHMZFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             errors=_errors,
         )
 
-    async def _test_connecton(self) -> None:
-        """Validate connection."""
-        client = DHMZApiClient(
-            session=async_create_clientsession(self.hass),
-        )
-        await client.async_get_data()
+    async def _async_refresh_catalogue(self) -> None:
+        """Get all feeds from the shared hub and merge their names in catalogue.
 
-    async def _return_locations(self) -> list:
-        """Get all possible locations."""
-        client = DHMZApiClient(
-            session=async_create_clientsession(self.hass),
-        )
-        meteo_data: DHMZMeteoData
-        meteo_data = await client.async_get_data()
-        return meteo_data.list_of_locations()
-
-    async def _return_regions(self) -> list:
-        """Get all possible regions."""
-        client = DHMZApiClient(
-            session=async_create_clientsession(self.hass),
+        Feeds downloaded by the hub within CATALOGUE_MAX_AGE (by this flow
+        or by running entries) are not downloaded again.
+        """
+        hub = async_get_hub(self.hass)
+        await asyncio.gather(
+            *(
+                hub.async_get_data(feed=feed, max_age=CATALOGUE_MAX_AGE)
+                for feed in CATALOGUE_FEEDS
+            )
         )
-        meteo_data: DHMZMeteoData
-        meteo_data = await client.async_get_data()
-        return meteo_data.list_of_forecast_regions()
-
-    async def _return_sea_locations(self) -> list:
-        """Get all possible sea locations."""
-        client = DHMZApiClient(
-            session=async_create_clientsession(self.hass),
+        await async_update_catalogue(self.hass, hub.data)
+
+    async def _async_refresh_catalogue_quietly(self) -> None:
+        """Refresh catalogue in background, errors are reported on submit."""
+        try:
+            await self._async_refresh_catalogue()
+        except DHMZApiClientError as exception:
+            LOGGER.debug("Background refresh of DHMZ catalogue failed: %s", exception)
+
+
+class DHMZOptionsFlowHandler(config_entries.OptionsFlow):
+    """Options flow for DHMZ Weather."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialize options flow."""
+        self.config_entry = config_entry
+
+    async def async_step_init(
+        self,
+        user_input: dict | None = None,
+    ) -> config_entries.FlowResult:
+        """Manage update intervals of the feeds and sensor throttling."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        option,
+                        default=self.config_entry.options.get(option, default),
+                    ): vol.All(
+                        selector.NumberSelector(
+                            selector.NumberSelectorConfig(
+                                min=1,
+                                max=1440,
+                                unit_of_measurement="min",
+                                mode=selector.NumberSelectorMode.BOX,
+                            ),
+                        ),
+                        vol.Coerce(int),
+                    )
+                    for option, default in FEED_UPDATE_INTERVALS.values()
+                }
+                | {
+                    vol.Required(
+                        option,
+                        default=self.config_entry.options.get(option, default),
+                    ): vol.All(
+                        selector.NumberSelector(
+                            selector.NumberSelectorConfig(
+                                min=0,
+                                max=100,
+                                step=0.1,
+                                mode=selector.NumberSelectorMode.BOX,
+                            ),
+                        ),
+                        vol.Coerce(float),
+                    )
+                    for option, default in SENSOR_DEADBANDS.values()
+                }
+                | {
+                    vol.Required(
+                        option,
+                        default=self.config_entry.options.get(option, default),
+                    ): vol.All(
+                        selector.NumberSelector(
+                            selector.NumberSelectorConfig(
+                                min=minimum,
+                                max=1440,
+                                unit_of_measurement="min",
+                                mode=selector.NumberSelectorMode.BOX,
+                            ),
+                        ),
+                        vol.Coerce(int),
+                    )
+                    for option, default, minimum in (
+                        (CONF_MIN_WRITE_INTERVAL, DEFAULT_MIN_WRITE_INTERVAL, 0),
+                        (CONF_MAX_SILENCE, DEFAULT_MAX_SILENCE, 1),
+                    )
+                }
+                | {
+                    vol.Optional(
+                        CONF_VIRTUAL_STATION,
+                        description={
+                            "suggested_value": self.config_entry.options.get(
+                                CONF_VIRTUAL_STATION
+                            )
+                        },
+                    ): selector.LocationSelector(
+                        selector.LocationSelectorConfig(radius=False),
+                    ),
+                }
+            ),
         )
-        meteo_data: DHMZMeteoData
-        meteo_data = await client.async_get_data()
-        return meteo_data.list_of_sea_locations()
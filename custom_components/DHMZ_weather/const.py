@@ -12,3 +12,66 @@ ATTRIBUTION = "Data provided by DHMZ (http://www.meteo.hr/)."
 CONF_LOCATION = "meteo_location"
 CONF_REGION = "meteo_region"
 CONF_SEA_LOCATION = "meteo_sea_location"
+# optional {"latitude", "longitude"} of a virtual station, set in options
+CONF_VIRTUAL_STATION = "virtual_station"
+
+# Keys of the shared feed hub, its HTTP session and station catalogue in
+# hass.data[DOMAIN]
+DATA_HUB = "hub"
+DATA_SESSION = "session"
+DATA_CATALOGUE = "catalogue"
+
+# DHMZ feeds
+FEED_CURRENT = "current"
+FEED_FORECAST_3D = "forecast_3d"
+FEED_FORECAST_7D = "forecast_7d"
+FEED_SEA = "sea"
+FEED_SUMMARY_TODAY = "summary_today"
+FEED_SUMMARY_TOMORROW = "summary_tomorrow"
+FORECAST_FEEDS = (FEED_FORECAST_3D, FEED_FORECAST_7D)
+SUMMARY_FEEDS = (FEED_SUMMARY_TODAY, FEED_SUMMARY_TOMORROW)
+
+# Update intervals (minutes) of the feeds, configurable in options
+CONF_CURRENT_INTERVAL = "current_interval"
+CONF_FORECAST_INTERVAL = "forecast_interval"
+CONF_SEA_INTERVAL = "sea_interval"
+CONF_SUMMARY_INTERVAL = "summary_interval"
+
+# Feed -> (option, default interval)
+FEED_UPDATE_INTERVALS = {
+    FEED_CURRENT: (CONF_CURRENT_INTERVAL, 5),
+    FEED_FORECAST_3D: (CONF_FORECAST_INTERVAL, 60),
+    FEED_SEA: (CONF_SEA_INTERVAL, 30),
+    # both daily summaries share one option
+    FEED_SUMMARY_TODAY: (CONF_SUMMARY_INTERVAL, 60),
+    FEED_SUMMARY_TOMORROW: (CONF_SUMMARY_INTERVAL, 60),
+}
+
+# Feeds refreshed in the background at setup, so the entry loads even when
+# they fail (daily summaries are extras, no other entity needs them)
+BACKGROUND_FEEDS = SUMMARY_FEEDS
+
+# Feeds fetched only while some entity needs them -> update interval (minutes)
+LAZY_FEED_UPDATE_INTERVALS = {
+    FEED_FORECAST_7D: 180,
+}
+
+# Throttling of current data sensors, configurable in options: changes
+# smaller than the deadband of the sensor class and changes within the
+# minimum write interval (minutes) are written only after max silence
+CONF_TEMPERATURE_DEADBAND = "temperature_deadband"
+CONF_HUMIDITY_DEADBAND = "humidity_deadband"
+CONF_PRESSURE_DEADBAND = "pressure_deadband"
+CONF_WIND_SPEED_DEADBAND = "wind_speed_deadband"
+CONF_MIN_WRITE_INTERVAL = "min_write_interval"
+CONF_MAX_SILENCE = "max_silence"
+
+# Sensor device class -> (option, default deadband)
+SENSOR_DEADBANDS = {
+    "temperature": (CONF_TEMPERATURE_DEADBAND, 0.0),
+    "humidity": (CONF_HUMIDITY_DEADBAND, 0.0),
+    "atmospheric_pressure": (CONF_PRESSURE_DEADBAND, 0.0),
+    "wind_speed": (CONF_WIND_SPEED_DEADBAND, 0.0),
+}
+DEFAULT_MIN_WRITE_INTERVAL = 0
+DEFAULT_MAX_SILENCE = 60
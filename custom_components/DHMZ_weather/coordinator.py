@@ -12,37 +12,47 @@ from homeassistant.helpers.update_coordinator import (
 from homeassistant.exceptions import ConfigEntryAuthFailed
 
 from .api import (
-    DHMZApiClient,
     DHMZApiClientAuthenticationError,
     DHMZApiClientError,
 )
 from .const import DOMAIN, LOGGER
+from .hub import DHMZFeedHub
+
+# Snapshots fetched by another entry within this margin of a full interval
+# are still considered part of the current update cycle.
+CYCLE_MARGIN = timedelta(seconds=10)
 
 
 # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
 class DHMZDataUpdateCoordinator(DataUpdateCoordinator):
-    """Class to manage fetching data from the API."""
+    """Class to manage fetching data of one DHMZ feed from the API."""
 
     config_entry: ConfigEntry
 
     def __init__(
         self,
         hass: HomeAssistant,
-        client: DHMZApiClient,
+        hub: DHMZFeedHub,
+        feed: str,
+        update_interval: timedelta,
     ) -> None:
         """Initialize."""
-        self.client = client
+        self.hub = hub
+        self.feed = feed
         super().__init__(
             hass=hass,
             logger=LOGGER,
-            name=DOMAIN,
-            update_interval=timedelta(minutes=5),
+            name=f"{DOMAIN} {feed}",
+            update_interval=update_interval,
         )
 
     async def _async_update_data(self):
         """Update data via library."""
         try:
-            return await self.client.async_get_data()
+            return await self.hub.async_get_data(
+                feed=self.feed,
+                max_age=self.update_interval - CYCLE_MARGIN,
+            )
         except DHMZApiClientAuthenticationError as exception:
             raise ConfigEntryAuthFailed(exception) from exception
         except DHMZApiClientError as exception:
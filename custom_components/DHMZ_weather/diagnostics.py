@@ -0,0 +1,55 @@
+"""Diagnostics support for DHMZ_weather."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_VIRTUAL_STATION, DATA_HUB, DOMAIN
+
+# virtual station is usually placed at home
+TO_REDACT = {CONF_VIRTUAL_STATION}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics of the config entry and of the shared feed hub."""
+    hub = hass.data[DOMAIN][DATA_HUB]
+    coordinators = hass.data[DOMAIN][entry.entry_id]
+    data = hub.data
+    return {
+        "entry": {
+            "data": dict(entry.data),
+            "options": async_redact_data(dict(entry.options), TO_REDACT),
+        },
+        "coordinators": {
+            feed: {
+                "update_interval": coordinator.update_interval.total_seconds(),
+                "last_update_success": coordinator.last_update_success,
+            }
+            for feed, coordinator in coordinators.items()
+        },
+        "feeds": None
+        if data is None
+        else {
+            feed: {
+                "updated": updated.isoformat(),
+                "stale": feed in data.stale_feeds,
+                "digest": data.digests.get(feed),
+                "regions": None
+                if (regions := data.regions.get(feed)) is None
+                else len(regions),
+            }
+            for feed, updated in data.updated.items()
+        },
+        "rows": None if data is None else data.row_counts(),
+        "telemetry": hub.client.telemetry.as_dict(),
+        "circuit_breakers": {
+            host: breaker.as_dict()
+            for host, breaker in hub.client.circuit_breakers.items()
+        },
+    }
@@ -1,6 +1,10 @@
 """DHMZEntity class."""
 from __future__ import annotations
 
+from time import monotonic
+from typing import Any
+
+from homeassistant.core import callback
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
@@ -9,7 +13,15 @@ from .coordinator import DHMZDataUpdateCoordinator
 
 
 class DHMZEntity(CoordinatorEntity):
-    """DHMZEntity class."""
+    """DHMZEntity class.
+
+    State is written on coordinator updates only when it changed: entities
+    whose source record (e.g. station of the current data) is the very
+    same object as at the last write are skipped right away, otherwise
+    their state values are compared with the last written ones. Changed
+    states may still be held back by _throttled(). Skipped and throttled
+    writes are counted in the feed telemetry.
+    """
 
     _attr_attribution = ATTRIBUTION
 
@@ -23,3 +35,57 @@ class DHMZEntity(CoordinatorEntity):
             model=VERSION,
             manufacturer=NAME,
         )
+        self._written_source: Any = None
+        self._written_values: tuple | None = None
+        self._written_at = monotonic()
+
+    def _state_source(self) -> Any:
+        """Return record the state is extracted from (None if there is none).
+
+        Unchanged feeds reuse parsed records, so the same record object means
+        the state is unchanged too.
+        """
+        return None
+
+    def _state_values(self) -> tuple:
+        """Return state and attributes compared between writes."""
+        return (self.state, self.state_attributes, self.extra_state_attributes)
+
+    def _throttled(self) -> bool:
+        """Return True if changed state should not be written yet.
+
+        Called only when availability did not change, the last written
+        values are in self._written_values (after availability).
+        """
+        return False
+
+    async def async_added_to_hass(self) -> None:
+        """When entity is added to hass, its state is written right after."""
+        await super().async_added_to_hass()
+        self._written_source = self._state_source()
+        self._written_values = (self.available, *self._state_values())
+        self._written_at = monotonic()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state if it changed since the last write."""
+        telemetry = self.coordinator.hub.client.telemetry.feed(self.coordinator.feed)
+        source = self._state_source()
+        if (
+            source is None
+            or source is not self._written_source
+            or self.available != self._written_values[0]
+        ):
+            values = (self.available, *self._state_values())
+            if values != self._written_values:
+                if values[0] == self._written_values[0] and self._throttled():
+                    telemetry.throttled_writes += 1
+                    return
+                self._written_source = source
+                self._written_values = values
+                self._written_at = monotonic()
+                telemetry.state_writes += 1
+                self.async_write_ha_state()
+                return
+            self._written_source = source
+        telemetry.skipped_writes += 1
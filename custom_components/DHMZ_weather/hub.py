@@ -0,0 +1,187 @@
+"""Shared feed hub for DHMZ_weather.
+
+All config entries share one hub stored in ``hass.data[DOMAIN]``, so every
+DHMZ feed is downloaded and parsed once per update cycle no matter how many
+entries are configured. The last snapshot is persisted in Home Assistant
+storage, so after a restart entities have data right away.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from datetime import timedelta
+from time import monotonic
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+from homeassistant.helpers.storage import Store
+
+from .api import DHMZApiClient, DHMZMeteoData
+from .telemetry import DHMZTelemetry
+from .const import (
+    DATA_HUB,
+    DATA_SESSION,
+    DOMAIN,
+    FEED_CURRENT,
+    FORECAST_FEEDS,
+    LOGGER,
+)
+
+# version 2 stores records (lists of parsed values) instead of text dicts
+STORAGE_VERSION = 2
+STORAGE_KEY = f"{DOMAIN}.snapshot"
+# snapshot is saved at most once per this many seconds
+STORAGE_SAVE_DELAY = 60
+
+
+class DHMZSnapshotStore(Store):
+    """Store of the last snapshot."""
+
+    async def _async_migrate_func(
+        self, old_major_version: int, old_minor_version: int, old_data: dict
+    ) -> None:
+        """Drop snapshot of an older version, feeds are simply downloaded again."""
+        return None
+
+
+class DHMZFeedHub:
+    """Fetch DHMZ feeds once and share the parsed snapshot between entries."""
+
+    def __init__(self, client: DHMZApiClient, store: Store) -> None:
+        """Initialize the hub."""
+        self.client = client
+        self.store = store
+        self._restore_lock = asyncio.Lock()
+        self._restored = False
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._fetched_at: dict[str, float] = {}
+        self._entries: dict[str, str] = {}
+        self._virtual_stations: dict[str, tuple[float, float]] = {}
+        self._virtual_data: dict[str, dict[str, float | None]] = {}
+        self._virtual_source: str | None = None
+        # callbacks adding hub-wide entities (feed telemetry sensors) to an
+        # entry, the entities belong to one entry at a time
+        self._entity_adders: dict[str, Callable[[], None]] = {}
+        self._entities_entry_id: str | None = None
+
+    @property
+    def data(self) -> DHMZMeteoData | None:
+        """Return the last snapshot (None before the first fetch)."""
+        return self.client.data
+
+    @property
+    def regions(self) -> set[str]:
+        """Return forecast regions used by registered entries."""
+        return set(self._entries.values())
+
+    def register(
+        self,
+        entry_id: str,
+        region: str,
+        virtual_station: tuple[float, float] | None = None,
+    ) -> None:
+        """Register config entry using this hub.
+
+        region is its forecast region, virtual_station coordinates of its
+        virtual station (if any).
+        """
+        if region not in self.regions:
+            # forecasts are parsed only for known regions, refetch them
+            for feed in FORECAST_FEEDS:
+                self._fetched_at.pop(feed, None)
+        self._entries[entry_id] = region
+        if virtual_station is not None:
+            self._virtual_stations[entry_id] = virtual_station
+            self._virtual_source = None  # interpolate again
+
+    def unregister(self, entry_id: str) -> bool:
+        """Unregister config entry, return True when hub is no longer used.
+
+        Hub-wide entities of the entry (already removed with its platforms)
+        are added to another entry.
+        """
+        self._entries.pop(entry_id, None)
+        self._virtual_stations.pop(entry_id, None)
+        self._entity_adders.pop(entry_id, None)
+        if self._entities_entry_id == entry_id:
+            self._entities_entry_id = None
+            if self._entity_adders:
+                self._entities_entry_id, add_entities = next(
+                    iter(self._entity_adders.items())
+                )
+                add_entities()
+        return not self._entries
+
+    def add_hub_entities(self, entry_id: str, add_entities: Callable[[], None]) -> None:
+        """Register callback adding hub-wide entities to the entry.
+
+        It is called right away if no other entry has them.
+        """
+        self._entity_adders[entry_id] = add_entities
+        if self._entities_entry_id is None:
+            self._entities_entry_id = entry_id
+            add_entities()
+
+    def virtual_data(self, entry_id: str) -> dict[str, float | None]:
+        """Return current data of the virtual station of the entry.
+
+        Data of all virtual stations is interpolated together, once for each
+        version of the current data feed.
+        """
+        if self.data is None:
+            return {}
+        if (source := self.data.digests.get(FEED_CURRENT)) != self._virtual_source:
+            self._virtual_data = self.data.interpolate(self._virtual_stations)
+            self._virtual_source = source
+        return self._virtual_data.get(entry_id, {})
+
+    async def async_restore(self) -> DHMZMeteoData | None:
+        """Load the persisted snapshot once, return the current snapshot."""
+        async with self._restore_lock:
+            if not self._restored:
+                self._restored = True
+                try:
+                    if (stored := await self.store.async_load()) is not None:
+                        self.client.restore(DHMZMeteoData.from_dict(stored))
+                except (KeyError, TypeError, ValueError) as exception:
+                    LOGGER.warning("Ignoring invalid stored DHMZ data: %s", exception)
+        return self.data
+
+    async def async_get_data(self, feed: str, max_age: timedelta) -> DHMZMeteoData:
+        """Return snapshot with feed not older than max_age, fetching it if needed."""
+        # Lock makes concurrent callers wait for a single download instead of
+        # starting their own, afterwards they all get the fresh snapshot.
+        async with self._locks.setdefault(feed, asyncio.Lock()):
+            fetched_at = self._fetched_at.get(feed)
+            if (
+                self.data is not None
+                and fetched_at is not None
+                and monotonic() - fetched_at < max_age.total_seconds()
+            ):
+                self.client.telemetry.feed(feed).cache_hits += 1
+                return self.data
+            LOGGER.debug(
+                "Fetching DHMZ %s feed for %d entries", feed, len(self._entries)
+            )
+            await self.client.async_get_data(feeds=(feed,), regions=self.regions)
+            self._fetched_at[feed] = monotonic()
+            self.store.async_delay_save(self.data.as_dict, STORAGE_SAVE_DELAY)
+            return self.data
+
+
+def async_get_hub(hass: HomeAssistant) -> DHMZFeedHub:
+    """Return the shared hub, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (hub := domain_data.get(DATA_HUB)) is None:
+        # own session, traced for DNS and connect times of the feeds, created
+        # once and reused by later hubs (it is closed when Home Assistant stops)
+        if (session := domain_data.get(DATA_SESSION)) is None:
+            session = domain_data[DATA_SESSION] = async_create_clientsession(
+                hass, trace_configs=[DHMZTelemetry.trace_config()]
+            )
+        hub = domain_data[DATA_HUB] = DHMZFeedHub(
+            client=DHMZApiClient(session=session, telemetry=DHMZTelemetry()),
+            store=DHMZSnapshotStore(hass, STORAGE_VERSION, STORAGE_KEY),
+        )
+    return hub
@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 import dataclasses
+from time import monotonic
+from typing import NamedTuple
 
 from homeassistant.components.sensor import (
     SensorEntity,
@@ -11,7 +13,9 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.const import (
+    EntityCategory,
     UnitOfTemperature,
+    UnitOfTime,
     UnitOfPressure,
     UnitOfSpeed,
     # UnitOfPrecipitationDepth,
@@ -20,9 +24,25 @@ from homeassistant.const import (
 from homeassistant.helpers.entity import generate_entity_id
 
 
-from .const import DOMAIN, CONF_LOCATION, CONF_SEA_LOCATION
+from .const import (
+    DOMAIN,
+    CONF_LOCATION,
+    CONF_SEA_LOCATION,
+    CONF_VIRTUAL_STATION,
+    CONF_MAX_SILENCE,
+    CONF_MIN_WRITE_INTERVAL,
+    DEFAULT_MAX_SILENCE,
+    DEFAULT_MIN_WRITE_INTERVAL,
+    FEED_CURRENT,
+    FEED_SEA,
+    FEED_SUMMARY_TODAY,
+    FEED_SUMMARY_TOMORROW,
+    FEED_UPDATE_INTERVALS,
+    SENSOR_DEADBANDS,
+)
 
 # from .const import LOGGER
+from .api import SYMBOL_CONDITIONS, DHMZObservation, DHMZSeaReading
 from .coordinator import DHMZDataUpdateCoordinator
 from .entity import DHMZEntity
 
@@ -58,11 +78,26 @@ ENTITY_DESCRIPTIONS = (
 )
 
 
+class DHMZThrottle(NamedTuple):
+    """Throttling of sensor state writes."""
+
+    deadband: float  # smaller changes are held back, 0 disables
+    min_interval: float  # seconds, changes are held back within it
+    max_silence: float  # seconds, changes are written at least this often
+
+
 async def async_setup_entry(hass, entry, async_add_devices):
     """Set up the sensor platform."""
-    coordinator = hass.data[DOMAIN][entry.entry_id]
+    coordinators = hass.data[DOMAIN][entry.entry_id]
     devices = []
     for entity_description in ENTITY_DESCRIPTIONS:
+        option, default = SENSOR_DEADBANDS[entity_description.device_class]
+        throttle = DHMZThrottle(
+            deadband=entry.options.get(option, default),
+            min_interval=60
+            * entry.options.get(CONF_MIN_WRITE_INTERVAL, DEFAULT_MIN_WRITE_INTERVAL),
+            max_silence=60 * entry.options.get(CONF_MAX_SILENCE, DEFAULT_MAX_SILENCE),
+        )
         new_entity_description = dataclasses.replace(
             entity_description,
             name=entry.data[CONF_LOCATION] + " " + str(entity_description.device_class),
@@ -80,7 +115,7 @@ async def async_setup_entry(hass, entry, async_add_devices):
 
         devices.append(
             DHMZSensor(
-                coordinator=coordinator,
+                coordinator=coordinators[FEED_CURRENT],
                 entity_description=new_entity_description,
                 location=entry.data[CONF_LOCATION],
                 data_type=_data_type,
@@ -90,13 +125,38 @@ async def async_setup_entry(hass, entry, async_add_devices):
                     hass=hass,
                 ),
                 unique_id=entry.entry_id,
+                throttle=throttle,
             )
         )
 
+        # sensors of the virtual station, estimated from the nearest stations
+        if CONF_VIRTUAL_STATION in entry.options:
+            devices.append(
+                DHMZVirtualSensor(
+                    coordinator=coordinators[FEED_CURRENT],
+                    entity_description=dataclasses.replace(
+                        entity_description,
+                        key=entity_description.key + "_virtual",
+                        name=entry.data[CONF_LOCATION]
+                        + " virtual "
+                        + str(entity_description.device_class),
+                    ),
+                    location="virtual",
+                    data_type=_data_type,
+                    sensor_entity_id=generate_entity_id(
+                        "sensor.{}",
+                        "DHMZ_" + entry.data[CONF_LOCATION] + "_virtual_" + _data_type,
+                        hass=hass,
+                    ),
+                    unique_id=entry.entry_id,
+                    throttle=throttle,
+                )
+            )
+
     # sea temp sensor has to be added manually as it uses different data source
     devices.append(
         DHMZCustomSensor(
-            coordinator=coordinator,
+            coordinator=coordinators[FEED_SEA],
             entity_description=SensorEntityDescription(
                 key="DHMZ_weather_sea_t",
                 icon="mdi:thermometer-water",
@@ -115,8 +175,72 @@ async def async_setup_entry(hass, entry, async_add_devices):
             unique_id=entry.entry_id,
         )
     )
+
+    # regional daily summary sensors (region nearest to the location)
+    for feed, day in (
+        (FEED_SUMMARY_TODAY, "today"),
+        (FEED_SUMMARY_TOMORROW, "tomorrow"),
+    ):
+        for data_type, temperature in (("Tmn", "low"), ("Tmx", "high")):
+            devices.append(
+                DHMZSummarySensor(
+                    coordinator=coordinators[feed],
+                    entity_description=SensorEntityDescription(
+                        key=f"DHMZ_weather_{day}_{temperature}",
+                        icon="mdi:thermometer-lines",
+                        device_class=SensorDeviceClass.TEMPERATURE,
+                        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+                        name=f"{entry.data[CONF_LOCATION]} {day} {temperature} temperature",
+                    ),
+                    location=entry.data[CONF_LOCATION],
+                    data_type=data_type,
+                    sensor_entity_id=generate_entity_id(
+                        "sensor.{}",
+                        "DHMZ_" + entry.data[CONF_LOCATION] + f"_{day}_{data_type}",
+                        hass=hass,
+                    ),
+                    unique_id=entry.entry_id + feed,
+                )
+            )
+
     async_add_devices(devices)
 
+    # fetch telemetry sensors read telemetry of the shared hub, so they are
+    # added to one entry only (and moved to another when it is unloaded)
+    coordinators[FEED_CURRENT].hub.add_hub_entities(
+        entry.entry_id,
+        lambda: async_add_devices(_telemetry_sensors(hass, coordinators)),
+    )
+
+
+def _telemetry_sensors(hass, coordinators) -> list[DHMZTelemetrySensor]:
+    """Return fetch telemetry sensors, disabled by default.
+
+    Lazy feeds are left out as a listener would keep them refreshed.
+    """
+    return [
+        DHMZTelemetrySensor(
+            coordinator=coordinators[feed],
+            entity_description=SensorEntityDescription(
+                key=f"DHMZ_weather_{feed}_fetch_time",
+                icon="mdi:timer-outline",
+                device_class=SensorDeviceClass.DURATION,
+                native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+                state_class=SensorStateClass.MEASUREMENT,
+                entity_category=EntityCategory.DIAGNOSTIC,
+                entity_registry_enabled_default=False,
+                name=f"DHMZ {feed} fetch time",
+            ),
+            location=feed,
+            data_type="fetch",
+            sensor_entity_id=generate_entity_id(
+                "sensor.{}", f"DHMZ_{feed}_fetch_time", hass=hass
+            ),
+            unique_id=f"{DOMAIN}_telemetry",
+        )
+        for feed in FEED_UPDATE_INTERVALS
+    ]
+
 
 # standard sensor class
 class DHMZSensor(DHMZEntity, SensorEntity):
@@ -130,6 +254,7 @@ class DHMZSensor(DHMZEntity, SensorEntity):
         data_type: str,
         sensor_entity_id: str | None = None,
         unique_id: str | None = None,
+        throttle: DHMZThrottle | None = None,
     ) -> None:
         """Initialize the sensor class."""
         super().__init__(coordinator)
@@ -138,13 +263,52 @@ class DHMZSensor(DHMZEntity, SensorEntity):
         self._data_type = data_type
         self.entity_id = sensor_entity_id
         self._attr_unique_id = unique_id + self._location + self._data_type
+        self._throttle = throttle
+
+    def _state_values(self) -> tuple:
+        """Return native value (compared with deadband), state and attributes."""
+        return (self.native_value, *super()._state_values())
+
+    def _throttled(self) -> bool:
+        """Return True if the change is too small or too early to be written."""
+        if self._throttle is None:
+            return False
+        silence = monotonic() - self._written_at
+        if silence >= self._throttle.max_silence:
+            return False
+        if silence < self._throttle.min_interval:
+            return True
+        value, written = self.native_value, self._written_values[1]
+        if value is None or written is None:
+            return False
+        return abs(value - written) < self._throttle.deadband
+
+    def _state_source(self) -> DHMZObservation | None:
+        """Return current data record of the location."""
+        return self.coordinator.data.current_observation(self._location)
 
     @property
-    def native_value(self) -> str:
+    def native_value(self) -> float | None:
         """Return the native value of the sensor."""
         return self.coordinator.data.current_meteo_data(self._location, self._data_type)
 
 
+# virtual station sensor class
+class DHMZVirtualSensor(DHMZSensor):
+    """DHMZ_weather Virtual station Sensor class."""
+
+    def _state_source(self) -> dict[str, float | None]:
+        """Return data of the virtual station, kept until interpolated again."""
+        return self.coordinator.hub.virtual_data(self.coordinator.config_entry.entry_id)
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the native value of the sensor."""
+        return self.coordinator.hub.virtual_data(
+            self.coordinator.config_entry.entry_id
+        ).get(self._data_type)
+
+
 # custom sensor class
 class DHMZCustomSensor(DHMZEntity, SensorEntity):
     """DHMZ Custom Sensor class."""
@@ -166,8 +330,12 @@ class DHMZCustomSensor(DHMZEntity, SensorEntity):
         self.entity_id = sensor_entity_id
         self._attr_unique_id = unique_id + self._location + self._data_type
 
+    def _state_source(self) -> DHMZSeaReading | None:
+        """Return sea temperature record of the location."""
+        return self.coordinator.data.current_sea_reading(self._location)
+
     @property
-    def native_value(self) -> str:
+    def native_value(self) -> float | None:
         """Return the native value of the sensor."""
         return self.coordinator.data.current_sea_temp_data(self._location, "Termin")
 
@@ -180,3 +348,78 @@ class DHMZCustomSensor(DHMZEntity, SensorEntity):
                 self._location, "datetime"
             )
         }
+
+
+# regional daily summary sensor class
+class DHMZSummarySensor(DHMZSensor):
+    """DHMZ_weather daily summary Sensor class."""
+
+    def _state_source(self) -> None:
+        """Return None, summary is looked up by coordinates of the location."""
+        return None
+
+    @property
+    def _summary(self) -> dict | None:
+        """Return summary of the region nearest to the location."""
+        # summary feeds are refreshed in the background, may not be loaded yet
+        if self.coordinator.data is None:
+            return None
+        # coordinates come from the current data feed, latest snapshot has it
+        hub_data = self.coordinator.hub.data
+        if (coordinates := hub_data.location_coordinates(self._location)) is None:
+            return None
+        return self.coordinator.data.daily_summary(
+            self.coordinator.feed, *coordinates, location=self._location
+        )
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the native value of the sensor."""
+        if (summary := self._summary) is None:
+            return None
+        return summary.get(self._data_type)
+
+    @property
+    def extra_state_attributes(self):
+        """Return additional attributes."""
+        if (summary := self._summary) is None:
+            return None
+        return {
+            "region": summary["region"],
+            "date": summary["date"],
+            "condition": SYMBOL_CONDITIONS.get(summary.get("vrijeme")),
+            "wind": summary.get("wind"),
+            "text": summary["text"],
+        }
+
+
+# feed telemetry sensor class
+class DHMZTelemetrySensor(DHMZSensor):
+    """DHMZ_weather feed fetch time Sensor class, location is the feed."""
+
+    def _state_source(self) -> None:
+        """Return None, telemetry is not part of the parsed data."""
+        return None
+
+    @property
+    def native_value(self) -> float | None:
+        """Return duration of the last request of the feed, in ms."""
+        telemetry = self.coordinator.hub.client.telemetry.feed(self._location)
+        if (fetch_time := telemetry.fetch.last) is None:
+            return None
+        return round(fetch_time * 1000, 1)
+
+    @property
+    def extra_state_attributes(self):
+        """Return counters and last / mean durations (in seconds) of the feed.
+
+        Time of the feed data and whether it is stale (the last good copy
+        served after failed updates or restored at startup) are added too.
+        """
+        telemetry = self.coordinator.hub.client.telemetry.feed(self._location)
+        attributes = telemetry.summary()
+        if (data := self.coordinator.hub.data) is not None:
+            updated = data.updated.get(self._location)
+            attributes["updated"] = None if updated is None else updated.isoformat()
+            attributes["stale"] = self._location in data.stale_feeds
+        return attributes
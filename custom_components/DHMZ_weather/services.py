@@ -0,0 +1,61 @@
+"""Services of DHMZ_weather."""
+
+from __future__ import annotations
+
+import voluptuous as vol
+from homeassistant.const import ATTR_LATITUDE, ATTR_LONGITUDE
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+
+from .const import DATA_HUB, DOMAIN
+
+SERVICE_NEAREST_STATIONS = "nearest_stations"
+
+ATTR_COUNT = "count"
+
+NEAREST_STATIONS_SCHEMA = vol.Schema(
+    {
+        vol.Inclusive(ATTR_LATITUDE, "coordinates"): cv.latitude,
+        vol.Inclusive(ATTR_LONGITUDE, "coordinates"): cv.longitude,
+        vol.Optional(ATTR_COUNT, default=3): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=50)
+        ),
+    }
+)
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register services of the integration."""
+
+    async def async_nearest_stations(call: ServiceCall) -> ServiceResponse:
+        """Return stations nearest to the coordinates (home by default)."""
+        hub = hass.data.get(DOMAIN, {}).get(DATA_HUB)
+        if hub is None or hub.data is None:
+            raise ServiceValidationError("No DHMZ data loaded yet")
+        latitude = call.data.get(ATTR_LATITUDE, hass.config.latitude)
+        longitude = call.data.get(ATTR_LONGITUDE, hass.config.longitude)
+        count = call.data[ATTR_COUNT]
+        return {
+            kind: [
+                {"name": name, "distance": round(distance, 1)}
+                for name, distance in nearest(latitude, longitude, count)
+            ]
+            for kind, nearest in (
+                ("locations", hub.data.nearest_locations),
+                ("sea_locations", hub.data.nearest_sea_locations),
+            )
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_NEAREST_STATIONS,
+        async_nearest_stations,
+        schema=NEAREST_STATIONS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
@@ -0,0 +1,90 @@
+"""Spatial index of DHMZ stations for nearest station queries."""
+
+from __future__ import annotations
+
+from heapq import heappush, heappushpop
+from math import asin, cos, radians, sin, sqrt
+
+EARTH_RADIUS_KM = 6371.0
+
+
+def distance_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Return great-circle (haversine) distance of two points in km."""
+    lat1, lon1, lat2, lon2 = map(radians, (lat1, lon1, lat2, lon2))
+    a = (
+        sin((lat2 - lat1) / 2) ** 2
+        + cos(lat1) * cos(lat2) * sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * asin(sqrt(a))
+
+
+class DHMZSpatialIndex:
+    """k-d tree of named points (latitude, longitude).
+
+    Points are projected to a plane scaled for the mean latitude, which is
+    accurate enough for an area the size of Croatia. The tree is stored in
+    one list, node of a subtree is at the middle of its slice.
+    """
+
+    def __init__(self, points: dict[str, tuple[float, float]]) -> None:
+        """Build index of points, name -> (latitude, longitude)."""
+        self.points = points
+        self._scale = (
+            cos(radians(sum(lat for lat, _ in points.values()) / len(points)))
+            if points
+            else 1.0
+        )
+        self._nodes = [
+            (self._project(lat, lon), name) for name, (lat, lon) in points.items()
+        ]
+        self._build(0, len(self._nodes), 0)
+
+    def __len__(self) -> int:
+        """Return number of indexed points."""
+        return len(self._nodes)
+
+    def _project(self, lat: float, lon: float) -> tuple[float, float]:
+        """Return planar coordinates (degrees of latitude) of the point."""
+        return (lon * self._scale, lat)
+
+    def _build(self, start: int, end: int, axis: int) -> None:
+        """Order nodes[start:end] as a subtree split on axis."""
+        if end - start <= 1:
+            return
+        self._nodes[start:end] = sorted(
+            self._nodes[start:end], key=lambda node: node[0][axis]
+        )
+        middle = (start + end) // 2
+        self._build(start, middle, 1 - axis)
+        self._build(middle + 1, end, 1 - axis)
+
+    def nearest(self, lat: float, lon: float, k: int = 1) -> list[tuple[str, float]]:
+        """Return up to k nearest points as (name, distance in km), nearest first."""
+        if k < 1 or not self._nodes:
+            return []
+        target = self._project(lat, lon)
+        best: list[tuple[float, str]] = []  # max heap of (-squared distance, name)
+        # subtrees to visit with squared distance of their splitting plane
+        stack = [(0, len(self._nodes), 0, 0.0)]
+        while stack:
+            start, end, axis, plane = stack.pop()
+            if start >= end or (len(best) == k and plane >= -best[0][0]):
+                continue
+            middle = (start + end) // 2
+            (x, y), name = self._nodes[middle]
+            squared = (x - target[0]) ** 2 + (y - target[1]) ** 2
+            if len(best) < k:
+                heappush(best, (-squared, name))
+            elif squared < -best[0][0]:
+                heappushpop(best, (-squared, name))
+            offset = target[axis] - (x, y)[axis]
+            lower = (start, middle, 1 - axis)
+            upper = (middle + 1, end, 1 - axis)
+            near, far = (lower, upper) if offset < 0 else (upper, lower)
+            # far side is visited last, only if it can still hold nearer points
+            stack.append((*far, offset**2))
+            stack.append((*near, 0.0))
+        return [
+            (name, distance_km(lat, lon, *self.points[name]))
+            for _, name in sorted(best, reverse=True)
+        ]
@@ -0,0 +1,182 @@
+"""Fetch and parse telemetry of the DHMZ feeds.
+
+Counters and duration histograms are kept per feed by the API client and
+shown in the diagnostics dump and in (disabled by default) diagnostic
+sensors. DNS and connect times come from aiohttp tracing, so they are
+recorded only for sessions created with trace_config() and only when a new
+connection is opened.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from time import perf_counter
+from types import SimpleNamespace
+
+import aiohttp
+
+# upper bounds of histogram buckets, in seconds (the last bucket is unbounded)
+HISTOGRAM_BOUNDS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class DHMZHistogram:
+    """Histogram of durations in seconds."""
+
+    __slots__ = ("buckets", "count", "total", "maximum", "last")
+
+    def __init__(self) -> None:
+        """Initialize empty histogram."""
+        self.buckets = [0] * (len(HISTOGRAM_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+        self.last: float | None = None
+
+    def add(self, value: float) -> None:
+        """Add a duration."""
+        self.buckets[bisect_left(HISTOGRAM_BOUNDS, value)] += 1
+        self.count += 1
+        self.total += value
+        self.maximum = max(self.maximum, value)
+        self.last = value
+
+    @property
+    def mean(self) -> float | None:
+        """Return mean duration (None if empty)."""
+        return self.total / self.count if self.count else None
+
+    def as_dict(self) -> dict:
+        """Return JSON serializable form, bucket counts keyed by upper bound."""
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.mean,
+            "max": self.maximum,
+            "last": self.last,
+            "buckets": {
+                f"le_{bound}": count
+                for bound, count in zip((*HISTOGRAM_BOUNDS, "inf"), self.buckets)
+            },
+        }
+
+
+class DHMZFeedTelemetry:
+    """Counters and duration histograms of one feed."""
+
+    HISTOGRAMS = ("dns", "connect", "wait", "transfer", "fetch", "parse")
+
+    def __init__(self) -> None:
+        """Initialize counters."""
+        self.requests = 0  # requests sent
+        self.errors = 0  # requests failed
+        self.retries = 0  # failed requests retried
+        self.rejected = 0  # requests refused, circuit of the host open
+        self.not_modified = 0  # 304 responses, cached body used
+        self.cache_hits = 0  # served by the hub without a request
+        self.reused = 0  # unchanged content, parsed data reused
+        self.bytes_received = 0  # body bytes (after decompression)
+        self.compressed = 0  # responses received compressed
+        self.rows = 0  # records in the last parse
+        self.last_error: str | None = None
+        self.state_writes = 0  # entity states written on updates
+        self.skipped_writes = 0  # entity states unchanged, not written
+        self.throttled_writes = 0  # changes held back by sensor deadbands
+        # dns: resolving the host, connect: opening a new connection (with
+        # dns), wait: until the response headers, transfer: reading the body,
+        # fetch: whole request, parse: building the parsed data
+        self.dns = DHMZHistogram()
+        self.connect = DHMZHistogram()
+        self.wait = DHMZHistogram()
+        self.transfer = DHMZHistogram()
+        self.fetch = DHMZHistogram()
+        self.parse = DHMZHistogram()
+
+    def record_error(self, exception: BaseException) -> None:
+        """Count failed request."""
+        self.errors += 1
+        self.last_error = repr(exception)
+
+    def summary(self) -> dict:
+        """Return counters and last / mean durations (for entity attributes)."""
+        summary = self._counters()
+        for name in self.HISTOGRAMS:
+            histogram = getattr(self, name)
+            summary[f"{name}_last"] = histogram.last
+            summary[f"{name}_mean"] = histogram.mean
+        return summary
+
+    def as_dict(self) -> dict:
+        """Return JSON serializable form, with whole histograms."""
+        return self._counters() | {
+            name: getattr(self, name).as_dict() for name in self.HISTOGRAMS
+        }
+
+    def _counters(self) -> dict:
+        """Return counters."""
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "rejected": self.rejected,
+            "not_modified": self.not_modified,
+            "cache_hits": self.cache_hits,
+            "reused": self.reused,
+            "bytes_received": self.bytes_received,
+            "compressed": self.compressed,
+            "rows": self.rows,
+            "last_error": self.last_error,
+            "state_writes": self.state_writes,
+            "skipped_writes": self.skipped_writes,
+            "throttled_writes": self.throttled_writes,
+        }
+
+
+class DHMZTelemetry:
+    """Telemetry of all feeds."""
+
+    def __init__(self) -> None:
+        """Initialize telemetry."""
+        self.feeds: dict[str, DHMZFeedTelemetry] = {}
+
+    def feed(self, feed: str) -> DHMZFeedTelemetry:
+        """Return telemetry of the feed."""
+        if (telemetry := self.feeds.get(feed)) is None:
+            telemetry = self.feeds[feed] = DHMZFeedTelemetry()
+        return telemetry
+
+    def as_dict(self) -> dict:
+        """Return JSON serializable form."""
+        return {feed: telemetry.as_dict() for feed, telemetry in self.feeds.items()}
+
+    @staticmethod
+    def trace_config() -> aiohttp.TraceConfig:
+        """Return aiohttp trace config recording DNS and connect times.
+
+        Requests pass their DHMZFeedTelemetry as trace_request_ctx.
+        """
+
+        def timer(name: str):
+            """Return callbacks adding time between them to histogram name."""
+
+            async def on_start(
+                session: aiohttp.ClientSession, context: SimpleNamespace, params
+            ) -> None:
+                setattr(context, name, perf_counter())
+
+            async def on_end(
+                session: aiohttp.ClientSession, context: SimpleNamespace, params
+            ) -> None:
+                if (telemetry := context.trace_request_ctx) is not None:
+                    elapsed = perf_counter() - getattr(context, name)
+                    getattr(telemetry, name).add(elapsed)
+
+            return on_start, on_end
+
+        trace_config = aiohttp.TraceConfig()
+        dns_start, dns_end = timer("dns")
+        trace_config.on_dns_resolvehost_start.append(dns_start)
+        trace_config.on_dns_resolvehost_end.append(dns_end)
+        connect_start, connect_end = timer("connect")
+        trace_config.on_connection_create_start.append(connect_start)
+        trace_config.on_connection_create_end.append(connect_end)
+        return trace_config
@@ -2,9 +2,13 @@
 
 from __future__ import annotations
 
-from datetime import datetime, time, timezone
+from collections.abc import Iterable
+from datetime import datetime, time
+from itertools import chain
+from typing import Literal
 import dataclasses
 
+from homeassistant.core import CALLBACK_TYPE, callback
 from homeassistant.helpers.entity import generate_entity_id
 
 from homeassistant.components.weather import (
@@ -30,7 +34,7 @@ from homeassistant.components.weather import (
     # ATTR_FORECAST_IS_DAYTIME,
     ATTR_FORECAST_CONDITION,
     # ATTR_FORECAST_HUMIDITY,
-    # ATTR_FORECAST_NATIVE_PRECIPITATION,
+    ATTR_FORECAST_NATIVE_PRECIPITATION,
     # ATTR_FORECAST_PRECIPITATION,
     # ATTR_FORECAST_PRECIPITATION_PROBABILITY,
     # ATTR_FORECAST_NATIVE_PRESSURE,
@@ -60,7 +64,7 @@ from homeassistant.const import (
     UnitOfTemperature,
     UnitOfPressure,
     UnitOfSpeed,
-    # UnitOfPrecipitationDepth,
+    UnitOfPrecipitationDepth,
     # UnitOfLength,
 )
 
@@ -69,9 +73,19 @@ from .const import (
     CONF_LOCATION,
     CONF_REGION,
     ATTRIBUTION,
+    FEED_CURRENT,
+    FEED_FORECAST_3D,
+    FEED_FORECAST_7D,
 )
 
 # from .const import LOGGER
+from .api import (
+    FORECAST_TZ,
+    DHMZForecastPoint,
+    DHMZForecastSeries,
+    DHMZObservation,
+)
+from .catalogue import async_get_catalogue
 from .coordinator import DHMZDataUpdateCoordinator
 from .entity import DHMZEntity
 
@@ -85,7 +99,14 @@ ENTITY_DESCRIPTIONS = (
 
 async def async_setup_entry(hass, entry, async_add_devices):
     """Set up DHMZ weather platform."""
-    coordinator = hass.data[DOMAIN][entry.entry_id]
+    coordinators = hass.data[DOMAIN][entry.entry_id]
+    # 7 days forecast is used only for regions it has, not worth downloading
+    # for the others
+    catalogue = await async_get_catalogue(hass)
+    if entry.data[CONF_REGION] in catalogue.extended_regions:
+        extended_forecast_coordinator = coordinators[FEED_FORECAST_7D]
+    else:
+        extended_forecast_coordinator = None
     devices = []
     for entity_description in ENTITY_DESCRIPTIONS:
         # entity_description.name = entry.data[CONF_LOCATION]
@@ -94,7 +115,9 @@ async def async_setup_entry(hass, entry, async_add_devices):
         )
         devices.append(
             DHMZWeather(
-                coordinator=coordinator,
+                coordinator=coordinators[FEED_CURRENT],
+                forecast_coordinator=coordinators[FEED_FORECAST_3D],
+                extended_forecast_coordinator=extended_forecast_coordinator,
                 entity_description=new_entity_description,
                 location=entry.data[CONF_LOCATION],
                 region=entry.data[CONF_REGION],
@@ -115,6 +138,8 @@ class DHMZWeather(DHMZEntity, WeatherEntity):
     def __init__(
         self,
         coordinator: DHMZDataUpdateCoordinator,
+        forecast_coordinator: DHMZDataUpdateCoordinator,
+        extended_forecast_coordinator: DHMZDataUpdateCoordinator | None,
         entity_description: WeatherEntityDescription,
         location: str,
         region: str,
@@ -123,6 +148,15 @@ class DHMZWeather(DHMZEntity, WeatherEntity):
     ):
         """Initialise the platform with a data instance and station name."""
         super().__init__(coordinator)
+        self._forecast_coordinator = forecast_coordinator
+        # 7 days forecast, fetched only while daily forecast has subscribers
+        # (None if the region has no 7 days forecast)
+        self._extended_forecast_coordinator = extended_forecast_coordinator
+        self._unsub_extended_forecast: CALLBACK_TYPE | None = None
+        # Built forecasts by type, valid while the forecast series of the
+        # region (3 and 7 days) are the same objects they were built from
+        self._forecasts: dict[WeatherEntityFeature, list[Forecast]] = {}
+        self._forecasts_source: tuple[DHMZForecastSeries | None, ...] = (None, None)
         self.entity_id = weather_entity_id
 
         self._location = location
@@ -132,6 +166,82 @@ class DHMZWeather(DHMZEntity, WeatherEntity):
         self._attr_name = entity_description.name
         self._attr_attribution = ATTRIBUTION
 
+    async def async_added_to_hass(self) -> None:
+        """When entity is added to hass."""
+        await super().async_added_to_hass()
+        # current conditions come from self.coordinator, forecasts from
+        # the forecast coordinator which only notifies forecast subscribers
+        self.async_on_remove(
+            self._forecast_coordinator.async_add_listener(
+                self._handle_forecast_coordinator_update
+            )
+        )
+        self.async_on_remove(self._unsubscribe_extended_forecast)
+
+    @callback
+    def _async_subscription_started(
+        self, forecast_type: Literal["daily", "hourly", "twice_daily"]
+    ) -> None:
+        """Start fetching 7 days forecast when daily forecast gets a subscriber."""
+        if forecast_type != "daily" or self._extended_forecast_coordinator is None:
+            return
+        self._unsub_extended_forecast = (
+            self._extended_forecast_coordinator.async_add_listener(
+                self._handle_forecast_coordinator_update
+            )
+        )
+        self.hass.async_create_task(
+            self._extended_forecast_coordinator.async_request_refresh()
+        )
+
+    @callback
+    def _async_subscription_ended(
+        self, forecast_type: Literal["daily", "hourly", "twice_daily"]
+    ) -> None:
+        """Stop fetching 7 days forecast when daily forecast has no subscribers."""
+        if forecast_type == "daily":
+            self._unsubscribe_extended_forecast()
+
+    @callback
+    def _unsubscribe_extended_forecast(self) -> None:
+        """Stop listening to 7 days forecast updates."""
+        if self._unsub_extended_forecast is not None:
+            self._unsub_extended_forecast()
+            self._unsub_extended_forecast = None
+
+    def _forecast_source(self) -> tuple[DHMZForecastSeries | None, ...]:
+        """Return 3 and 7 days forecast series of the region.
+
+        Unchanged feeds reuse parsed series, so the same objects mean the
+        forecasts are unchanged too.
+        """
+        data = self._forecast_coordinator.data
+        extended_data = (
+            None
+            if self._extended_forecast_coordinator is None
+            else self._extended_forecast_coordinator.data
+        )
+        return (
+            None if data is None else data.fc_series(self._region),
+            None
+            if extended_data is None
+            else extended_data.fc_series(self._region, FEED_FORECAST_7D),
+        )
+
+    @callback
+    def _handle_forecast_coordinator_update(self) -> None:
+        """Handle forecast update, only new forecast series of the region count."""
+        source = self._forecast_source()
+        if all(new is old for new, old in zip(source, self._forecasts_source)):
+            return
+        self._forecasts_source = source
+        self._forecasts.clear()
+        self.hass.async_create_task(self.async_update_listeners(None))
+
+    def _state_source(self) -> DHMZObservation | None:
+        """Return current data record of the location."""
+        return self.coordinator.data.current_observation(self._location)
+
     @property
     def supported_features(self) -> WeatherEntityFeature:
         """Return supported features."""
@@ -196,10 +306,10 @@ class DHMZWeather(DHMZEntity, WeatherEntity):
     #    )
     #    return self.coordinator.data.current_precipitation(self._location)
 
-    # @property
-    # def native_precipitation_unit(self):
-    #    """Return the precipitation unit."""
-    #    return UnitOfPrecipitationDepth.MILLIMETERS
+    @property
+    def native_precipitation_unit(self):
+        """Return the precipitation unit."""
+        return UnitOfPrecipitationDepth.MILLIMETERS
 
     # @property
     # def native_wind_speed(self):
@@ -258,141 +368,169 @@ class DHMZWeather(DHMZEntity, WeatherEntity):
     # @property
     # def uv_index(self) -> float | None:
 
-    def _separate_forecasts_by_dates(self, list_of_meteo_data: list) -> list:
-        """Sepparate forecasts by dates."""
-        different_dates = []
-        forecasts_by_dates = []
-
-        # extract different dates
-        for fc in list_of_meteo_data:
-            # sort by date
-            different_dates.append(
-                datetime.fromisoformat(fc[ATTR_FORECAST_TIME]).date()
+    def _convert_to_hourly_forecast(
+        self, series: DHMZForecastSeries, conditions: list, times: dict
+    ) -> list[Forecast]:
+        """Convert forecast series to the hourly forcasts list."""
+        return [
+            {
+                ATTR_FORECAST_TIME: times[fc_timestamp].isoformat(),
+                # missing temperature is NaN
+                ATTR_FORECAST_NATIVE_TEMP: fc_temp if fc_temp == fc_temp else None,
+                ATTR_FORECAST_CONDITION: conditions[fc_symbol],
+            }
+            for fc_timestamp, fc_temp, fc_symbol in zip(
+                series.timestamps,
+                series.temperatures,
+                series.symbols,
             )
-        list_of_dates = sorted(set(different_dates))
+        ]
 
-        # sepparate forecasts by dates
-        for each_date in list_of_dates:
-            same_date_forecasts = [
-                fc
-                for fc in list_of_meteo_data
-                if datetime.fromisoformat(fc[ATTR_FORECAST_TIME]).date() == each_date
-            ]
-            forecasts_by_dates.append(same_date_forecasts)
+    @staticmethod
+    def _forecast_points(
+        series: DHMZForecastSeries, conditions: list, after: int | None = None
+    ) -> Iterable[DHMZForecastPoint]:
+        """Return forecast points of the series.
 
-        return forecasts_by_dates
+        Only points later than after are returned if it is given.
+        """
+        return (
+            DHMZForecastPoint(
+                fc_timestamp, fc_temp, conditions[fc_symbol], fc_precipitation
+            )
+            for fc_timestamp, fc_temp, fc_symbol, fc_precipitation in zip(
+                series.timestamps,
+                series.temperatures,
+                series.symbols,
+                series.precipitation,
+            )
+            if after is None or fc_timestamp > after
+        )
+
+    def _convert_to_daily_forecast(
+        self, points: Iterable[DHMZForecastPoint], times: dict
+    ) -> list[Forecast]:
+        """Aggregate forecast points into the daily forcasts list in one pass.
+
+        Each day gets min / max temperature, sum of precipitation and time,
+        condition and temperature of the forecast closest to local 12:00.
+        Missing values (NaN) are left out of min / max and of the sum.
+        """
+        _forecasts_by_dates = {}
+        _noon_distances = {}
+
+        for fc_timestamp, fc_temp, fc_condition, fc_precipitation in points:
+            fc_time = times[fc_timestamp]
+            fc_date = fc_time.date()
+            noon_distance = abs(
+                datetime.combine(fc_date, time(12), FORECAST_TZ).timestamp()
+                - fc_timestamp
+            )
+            if (_forecast := _forecasts_by_dates.get(fc_date)) is None:
+                _forecast = _forecasts_by_dates[fc_date] = {
+                    ATTR_FORECAST_NATIVE_TEMP: None,
+                    ATTR_FORECAST_NATIVE_TEMP_LOW: None,
+                    ATTR_FORECAST_NATIVE_PRECIPITATION: None,
+                }
+            if fc_temp == fc_temp:
+                if _forecast[ATTR_FORECAST_NATIVE_TEMP] is None:
+                    _forecast[ATTR_FORECAST_NATIVE_TEMP] = fc_temp
+                    _forecast[ATTR_FORECAST_NATIVE_TEMP_LOW] = fc_temp
+                else:
+                    _forecast[ATTR_FORECAST_NATIVE_TEMP] = max(
+                        _forecast[ATTR_FORECAST_NATIVE_TEMP], fc_temp
+                    )
+                    _forecast[ATTR_FORECAST_NATIVE_TEMP_LOW] = min(
+                        _forecast[ATTR_FORECAST_NATIVE_TEMP_LOW], fc_temp
+                    )
+            if fc_precipitation == fc_precipitation:
+                _forecast[ATTR_FORECAST_NATIVE_PRECIPITATION] = (
+                    _forecast[ATTR_FORECAST_NATIVE_PRECIPITATION] or 0.0
+                ) + fc_precipitation
+            # pick forecast closest to 12:00
+            if noon_distance <= _noon_distances.get(fc_date, noon_distance):
+                _noon_distances[fc_date] = noon_distance
+                _forecast[ATTR_FORECAST_TIME] = fc_time.isoformat()
+                _forecast[ATTR_FORECAST_CONDITION] = fc_condition
+                _forecast[ATTR_FORECAST_NATIVE_APPARENT_TEMP] = (
+                    fc_temp if fc_temp == fc_temp else None
+                )
 
-    def _convert_to_hourly_forecast(self, list_of_meteo_data: list) -> list[Forecast]:
-        """Convert data to fit into the hourly forcasts list."""
         _forecasts = []
-        for _forecast in list_of_meteo_data:
-            # remove unwanted data (max, min temperatures)
-            del _forecast[ATTR_FORECAST_NATIVE_TEMP_LOW]
-            del _forecast[ATTR_FORECAST_NATIVE_APPARENT_TEMP]
+        for fc_date in sorted(_forecasts_by_dates):
+            _forecast = _forecasts_by_dates[fc_date]
+            if (
+                precipitation := _forecast[ATTR_FORECAST_NATIVE_PRECIPITATION]
+            ) is not None:
+                _forecast[ATTR_FORECAST_NATIVE_PRECIPITATION] = round(precipitation, 1)
             _forecasts.append(_forecast)
         return _forecasts
 
-    def _convert_to_daily_forecast(self, list_of_meteo_data: list) -> list[Forecast]:
-        """Convert lots of data to fit into the daily forcasts list."""
-        _forecasts = []
-
-        # separete forecasts by dates
-        _forecasts_by_dates = self._separate_forecasts_by_dates(list_of_meteo_data)
-
-        # find sutable forecasts
-        for same_dates_fc in _forecasts_by_dates:
-            # calculate daily min / max temperature
-            min_temp = min(int(i[ATTR_FORECAST_NATIVE_TEMP]) for i in same_dates_fc)
-            max_temp = max(int(i[ATTR_FORECAST_NATIVE_TEMP]) for i in same_dates_fc)
-            # pick forecast closest to 12:00
-            test_date = datetime.combine(
-                datetime.fromisoformat(same_dates_fc[0][ATTR_FORECAST_TIME]).date(),
-                time(12, tzinfo=timezone.utc),
-            )
-            fc_dict = {
-                abs(
-                    test_date.timestamp()
-                    - datetime.fromisoformat(date[ATTR_FORECAST_TIME]).timestamp()
-                ): date
-                for date in same_dates_fc
-            }
-            picked_forecast = fc_dict[min(fc_dict.keys())]
-            # put min /max temperature into daily forcast data
-            picked_forecast[ATTR_FORECAST_NATIVE_TEMP] = max_temp
-            picked_forecast[ATTR_FORECAST_NATIVE_TEMP_LOW] = min_temp
-            _forecasts.append(picked_forecast)
-
-        return _forecasts
+    def _get_cached_forecast(self, fc_type: WeatherEntityFeature) -> list[Forecast]:
+        """Return forecast, built only once per forecast data update."""
+        if (forecasts := self._forecasts.get(fc_type)) is None:
+            self._forecasts_source = self._forecast_source()
+            forecasts = self._forecasts[fc_type] = self._get_forecast(fc_type)
+        return forecasts
 
     def _get_forecast(self, fc_type=None) -> list[Forecast]:
         """Return forecast."""
-        # _forecasts = []
-        _list_of_meteo_data = []
-        # Putting together all data from API, using dates to create a list of dictionaries
-        for (
-            fc_date,
-            fc_min_temp,
-            fc_max_temp,
-            fc_condition,
-            # fc_humidity,
-            # fc_pressure,
-            fc_temp,
-            # fc_dew_point,
-            # fc_wind_speed,
-            # fc_wind_gust,
-            # fc_wind_bearing,
-        ) in zip(
-            self.coordinator.data.fc_list_of_dates(self._region),
-            self.coordinator.data.fc_list_of_min_temps(self._region),
-            self.coordinator.data.fc_list_of_max_temps(self._region),
-            self.coordinator.data.fc_list_of_condtions(self._region),
-            # self.coordinator.data.fc_list_of_humidities(self._region),
-            # self.coordinator.data.fc_list_of_presures(self._region),
-            self.coordinator.data.fc_list_of_temps(self._region),
-            # self.coordinator.data.fc_list_of_dew_points(self._region),
-            # self.coordinator.data.fc_list_of_wind_speeds(self._region),
-            # self.coordinator.data.fc_list_of_wind_gusts(self._region),
-            # self.coordinator.data.fc_list_of_wind_bearing(self._region),
-        ):
-            _list_of_meteo_data.append(
-                {
-                    ATTR_FORECAST_TIME: fc_date,
-                    ATTR_FORECAST_NATIVE_TEMP_LOW: fc_min_temp,
-                    ATTR_FORECAST_NATIVE_TEMP: fc_max_temp,
-                    ATTR_FORECAST_CONDITION: fc_condition,
-                    # ATTR_FORECAST_HUMIDITY: fc_humidity,
-                    # ATTR_FORECAST_NATIVE_PRESSURE: fc_pressure,
-                    ATTR_FORECAST_NATIVE_APPARENT_TEMP: fc_temp,
-                    # ATTR_FORECAST_NATIVE_DEW_POINT: fc_dew_point,
-                    # ATTR_FORECAST_NATIVE_WIND_SPEED: fc_wind_speed,
-                    # ATTR_FORECAST_NATIVE_WIND_GUST_SPEED: fc_wind_gust,
-                    # ATTR_FORECAST_WIND_BEARING: fc_wind_bearing,
-                }
-            )
+        series = self._forecast_coordinator.data.fc_series(self._region)
+        if series is None:
+            return []
+        conditions = self._forecast_coordinator.data.fc_conditions()
+        times = self._forecast_coordinator.data.fc_times()
 
         # Return correct forecast
         if fc_type == WeatherEntityFeature.FORECAST_HOURLY:
             # return hourly version
-            return self._convert_to_hourly_forecast(_list_of_meteo_data)
+            return self._convert_to_hourly_forecast(series, conditions, times)
+
+        points = self._forecast_points(series, conditions)
+        # 7 days forecast (when loaded) continues after the last 3 days one
+        extended_data = (
+            None
+            if self._extended_forecast_coordinator is None
+            else self._extended_forecast_coordinator.data
+        )
+        if (
+            extended_data is not None
+            and len(series)
+            and (
+                extended_series := extended_data.fc_series(
+                    self._region, FEED_FORECAST_7D
+                )
+            )
+            is not None
+        ):
+            points = chain(
+                points,
+                self._forecast_points(
+                    extended_series,
+                    extended_data.fc_conditions(FEED_FORECAST_7D),
+                    after=series.timestamps[-1],
+                ),
+            )
+            times = times | extended_data.fc_times(FEED_FORECAST_7D)
 
         if fc_type == WeatherEntityFeature.FORECAST_TWICE_DAILY:
             # return twice-daily version
-            return self._convert_to_daily_forecast(_list_of_meteo_data)
+            return self._convert_to_daily_forecast(points, times)
 
         # return daily version (default)
-        return self._convert_to_daily_forecast(_list_of_meteo_data)
+        return self._convert_to_daily_forecast(points, times)
 
     async def async_forecast_hourly(self) -> list[Forecast]:
         """Return hourly forecast."""
         # LOGGER.debug("weather.py > async_forecast_hourly()")
-        return self._get_forecast(WeatherEntityFeature.FORECAST_HOURLY)
+        return self._get_cached_forecast(WeatherEntityFeature.FORECAST_HOURLY)
 
     async def async_forecast_twice_daily(self) -> list[Forecast]:
         """Return twice_daily forecast."""
         # LOGGER.debug("weather.py > async_forecast_twice_daily()")
-        return self._get_forecast(WeatherEntityFeature.FORECAST_TWICE_DAILY)
+        return self._get_cached_forecast(WeatherEntityFeature.FORECAST_TWICE_DAILY)
 
     async def async_forecast_daily(self) -> list[Forecast]:
         """Return daily forecast."""
         # LOGGER.debug("weather.py > async_forecast_daily()")
-        return self._get_forecast(WeatherEntityFeature.FORECAST_DAILY)
+        return self._get_cached_forecast(WeatherEntityFeature.FORECAST_DAILY)